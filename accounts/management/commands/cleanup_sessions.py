@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import StudentSession
+from competitions.engine import FileStorage, get_emergency_storage, get_journaled_storage
+from dashboard.stats import record_sessions_ended
+
+
+class Command(BaseCommand):
+    help = 'حذف الجلسات المنتهية وإنهاء جلسات الطلاب القديمة'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, default=None,
+                            help='عمر جلسة الطالب بالثواني قبل اعتبارها منتهية (الافتراضي: STUDENT_SESSION_AGE)')
+
+    def handle(self, *args, **options):
+        # حذف جلسات Django المنتهية (لا شيء لحذفه مع جلسات الذاكرة المؤقتة البحتة)
+        self.stdout.write(f'🧹 حذف الجلسات المنتهية ({settings.SESSION_ENGINE.rsplit(".", 1)[-1]})...')
+        call_command('clearsessions')
+
+        max_age = options['max_age'] or settings.STUDENT_SESSION_AGE
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        ended = StudentSession.objects.filter(is_active=True, session_start__lt=cutoff).update(is_active=False)
+        record_sessions_ended(ended)
+
+        self.stdout.write(f'✅ تم إنهاء {ended} جلسة طالب أقدم من {max_age // 60} دقيقة')
+
+        # ملفات حالة المسابقات بدون قاعدة بيانات (النظام الطارئ والسجل)؛ السجل نفسه لا يُحذف هنا
+        pruned = sum(
+            storage.prune(max_age)
+            for storage in (get_emergency_storage(), get_journaled_storage())
+            if isinstance(storage, FileStorage)
+        )
+        self.stdout.write(f'✅ تم حذف {pruned} ملف مسابقة قديم')
@@ -25,6 +25,8 @@ class Migration(migrations.Migration):
 
     dependencies = [
         ('accounts', '0001_initial'),
+        # تستخدم نموذج User الحالي، فتحتاج جدول auth_user بآخر أعمدته
+        ('auth', '0012_alter_user_first_name_max_length'),
     ]
 
     operations = [
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_create_admin_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentsession',
+            index=models.Index(fields=['is_active', 'session_start'], name='student_session_active_idx'),
+        ),
+    ]
@@ -28,6 +28,9 @@ class StudentSession(models.Model):
     class Meta:
         verbose_name = "جلسة طالب"
         verbose_name_plural = "جلسات الطلاب"
+        indexes = [
+            models.Index(fields=['is_active', 'session_start'], name='student_session_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student_name} - {self.grade_level}"
@@ -5,6 +5,10 @@ from django.contrib.auth.models import User
 from django.contrib import messages
 from django.conf import settings
 from django.http import HttpResponse
+from django.template.loader import get_template
+from alhassan.page_cache import CSRF_PLACEHOLDER, cached_page
+from dashboard.stats import record_session_started
+from competitions.progress import get_progress
 from .models import StudentSession, TeacherProfile
 
 
@@ -35,6 +39,7 @@ def student_login(request):
 
             # التحقق من رمز الدخول
             if access_code == settings.STUDENT_ACCESS_CODE:
+                progress = get_progress(request)
                 # التحقق من اختيار مستوى الصعوبة
                 if not difficulty_level:
                     messages.error(request, 'يرجى اختيار مستوى الصعوبة')
@@ -47,25 +52,38 @@ def student_login(request):
                         access_code=access_code,
                         grade_level=grade_level
                     )
+                    record_session_started()
 
                     # حفظ معلومات الطالب في الجلسة
-                    request.session['student_id'] = session.id
-                    request.session['student_name'] = student_name
-                    request.session['grade_level'] = grade_level
-                    request.session['difficulty_level'] = difficulty_level
+                    progress['student_id'] = session.id
+                    progress['student_name'] = student_name
+                    progress['grade_level'] = grade_level
+                    progress['difficulty_level'] = difficulty_level
+                    progress.set_expiry(settings.STUDENT_SESSION_AGE)
 
                     return redirect('competition_start')
                 except Exception as e:
                     # في حالة عدم وجود جداول قاعدة البيانات
                     # حفظ البيانات في الجلسة مباشرة
-                    request.session['student_name'] = student_name
-                    request.session['grade_level'] = grade_level
-                    request.session['difficulty_level'] = difficulty_level
+                    progress['student_name'] = student_name
+                    progress['grade_level'] = grade_level
+                    progress['difficulty_level'] = difficulty_level
 
                     return redirect('competition_start')
             else:
                 messages.error(request, 'رمز الدخول غير صحيح')
 
+            return render(request, 'accounts/student_login.html')
+
+        # صفحة الدخول ثابتة ما لم توجد رسائل معلقة، فتُقدم من التخزين مع رمز CSRF جديد
+        if not len(messages.get_messages(request)):
+            template = get_template('accounts/student_login.html')
+            return cached_page(
+                request, 'student_login',
+                lambda: template.render({'csrf_token': CSRF_PLACEHOLDER}),
+                source=template.origin.name, csrf=True
+            )
+
         return render(request, 'accounts/student_login.html')
 
     except Exception as e:
@@ -85,9 +103,10 @@ def student_login_simple(request):
         # التحقق من رمز الدخول
         if access_code == 'ben25':
             # حفظ البيانات في الجلسة مباشرة
-            request.session['student_name'] = student_name
-            request.session['grade_level'] = grade_level
-            request.session['difficulty_level'] = difficulty_level
+            progress = get_progress(request)
+            progress['student_name'] = student_name
+            progress['grade_level'] = grade_level
+            progress['difficulty_level'] = difficulty_level
 
             return redirect('competition_start')
         else:
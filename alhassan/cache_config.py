@@ -0,0 +1,62 @@
+"""
+إعدادات الذاكرة المؤقتة والجلسات - منصة المسابقات الرياضية
+Builds CACHES and SESSION_ENGINE from environment variables so that
+student sessions can be moved off the database during exam peaks:
+
+    CACHE_BACKEND   locmem | file | redis (default: locmem, file in production)
+    CACHE_LOCATION  directory for the file backend (default: system temp dir)
+    REDIS_URL       server for the redis backend (requires the redis package)
+    SESSION_BACKEND db (default) | cached_db | cache
+
+locmem is per process. With several workers, use the file or redis
+backend for sessions ('cache' and 'cached_db' would otherwise serve
+stale sessions from another worker's memory).
+"""
+
+import os
+import tempfile
+
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+}
+
+
+def _cache(backend, name):
+    if backend == 'redis':
+        return {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+            'KEY_PREFIX': name,
+        }
+    if backend == 'file':
+        location = os.environ.get('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'alhassan-cache'))
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(location, name),
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': name,
+    }
+
+
+def build_caches(default_backend='locmem'):
+    """ذاكرة مؤقتة عامة وأخرى منفصلة للجلسات (حتى لا تطرد بيانات اللوحة الجلسات)
+
+    CACHE_BACKEND يتقدم على default_backend الخاص بملف الإعدادات.
+    """
+    backend = os.environ.get('CACHE_BACKEND', default_backend).lower()
+    sessions = _cache(backend, 'sessions')
+    # الجلسات لا تنتهي قبل انتهاء صلاحية الكوكي
+    sessions['TIMEOUT'] = None
+    return {
+        'default': _cache(backend, 'default'),
+        'sessions': sessions,
+    }
+
+
+def session_engine():
+    return SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'db').lower()]
@@ -0,0 +1,6 @@
+"""
+محركات قاعدة البيانات - منصة المسابقات الرياضية
+Thin subclasses of Django's PostgreSQL and SQLite backends that time every
+new connection (connect, TLS handshake, session setup or pool checkout)
+for the Server-Timing header. See alhassan/timing.py.
+"""
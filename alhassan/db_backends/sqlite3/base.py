@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base
+
+from alhassan.timing import TimedConnectMixin
+
+
+class DatabaseWrapper(TimedConnectMixin, base.DatabaseWrapper):
+    pass
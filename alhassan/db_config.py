@@ -0,0 +1,110 @@
+"""
+إعدادات قاعدة البيانات - منصة المسابقات الرياضية
+Builds the DATABASES entry from environment variables.
+
+SQLite (sqlite_database): the default 'production' profile lets several
+gunicorn workers write answers at the same time:
+
+    journal_mode=WAL      readers never block the writer, and the writer
+                          never blocks readers
+    synchronous=NORMAL    fsync at checkpoints only (safe with WAL)
+    busy timeout          wait for the write lock instead of failing with
+                          "database is locked"
+    BEGIN IMMEDIATE       take the write lock when the transaction starts,
+                          so no transaction has to upgrade a read lock
+                          (an upgrade fails at once, without waiting)
+    mmap_size             read pages through memory-mapped I/O
+    CONN_MAX_AGE          keep the connection, and its PRAGMAs, between
+                          requests
+
+    SQLITE_PROFILE        production (default) | default (Django defaults)
+    SQLITE_BUSY_TIMEOUT   seconds to wait for the write lock (default 10)
+    SQLITE_MMAP_SIZE      bytes (default 256 MB)
+    DB_CONN_MAX_AGE       seconds (default 600)
+
+PostgreSQL (postgres_database, from DATABASE_URL): TLS is required, so a
+fresh connection per request pays a TLS handshake plus backend startup.
+Connections are either taken from Django's native psycopg pool, one pool
+per gunicorn worker process, or kept open with CONN_MAX_AGE and
+CONN_HEALTH_CHECKS:
+
+    DB_POOL               true (default when psycopg_pool is installed) | false
+    DB_MAX_CONNECTIONS    connections this service may open in total
+                          (default 20); split across WEB_CONCURRENCY workers
+    WEB_CONCURRENCY       gunicorn worker count (gunicorn reads it too)
+    GUNICORN_THREADS      threads per worker (default 1)
+
+Both engines go through alhassan.db_backends, which times every new
+connection for the Server-Timing header (alhassan/timing.py).
+"""
+
+import os
+from importlib.util import find_spec
+
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size={mmap_size}',
+    'PRAGMA temp_store=MEMORY',
+    # إبقاء ملف WAL صغيراً بعد نقاط الحفظ
+    'PRAGMA journal_size_limit=67108864',
+)
+
+
+def sqlite_options(busy_timeout=None, mmap_size=None):
+    """OPTIONS لاتصال SQLite في ملف الإنتاج"""
+    busy_timeout = busy_timeout or int(os.environ.get('SQLITE_BUSY_TIMEOUT', 10))
+    mmap_size = mmap_size or int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    return {
+        'timeout': busy_timeout,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join(SQLITE_PRAGMAS).format(mmap_size=mmap_size),
+    }
+
+
+def sqlite_database(name, profile=None):
+    """إعداد قاعدة بيانات SQLite حسب SQLITE_PROFILE"""
+    profile = profile or os.environ.get('SQLITE_PROFILE', 'production').lower()
+    database = {
+        'ENGINE': 'alhassan.db_backends.sqlite3',
+        'NAME': name,
+    }
+    if profile == 'production':
+        database['OPTIONS'] = sqlite_options()
+        database['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+        database['CONN_HEALTH_CHECKS'] = True
+    return database
+
+
+def pool_size(workers=None, threads=None, max_connections=None):
+    """حجم مجمع الاتصالات لكل عامل: خيوط الطلبات وخيطا الخلفية، ضمن حصة العامل من الاتصالات"""
+    workers = workers or int(os.environ.get('WEB_CONCURRENCY', 3))
+    threads = threads or int(os.environ.get('GUNICORN_THREADS', 1))
+    max_connections = max_connections or int(os.environ.get('DB_MAX_CONNECTIONS', 20))
+    # خيطا الخلفية: تعبئة مخزن الأسئلة وإعادة تشغيل سجل الكتابة المتأخرة
+    return max(1, min(threads + 2, max_connections // workers))
+
+
+def postgres_database(url):
+    """إعداد PostgreSQL من DATABASE_URL مع مجمع اتصالات أو اتصالات دائمة"""
+    import dj_database_url
+
+    database = dj_database_url.parse(url, ssl_require=True)
+    if database['ENGINE'] == 'django.db.backends.postgresql':
+        database['ENGINE'] = 'alhassan.db_backends.postgresql'
+
+    use_pool = os.environ.get('DB_POOL', 'true').lower() == 'true' and find_spec('psycopg_pool') is not None
+    if use_pool:
+        # المجمع لا يعمل مع الاتصالات الدائمة: CONN_MAX_AGE يبقى 0
+        size = pool_size()
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': 1,
+            'max_size': size,
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+    else:
+        database['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+        database['CONN_HEALTH_CHECKS'] = True
+    return database
@@ -0,0 +1,89 @@
+"""
+فحص صحة النظام - منصة المسابقات الرياضية
+JSON liveness (/healthz) and readiness (/readyz) endpoints for the load
+balancer. The probes are backend-agnostic: a SELECT 1 ping, the pending
+migration plan and a cache round-trip. Each result is kept in-process for
+HEALTH_CACHE_SECONDS, so frequent polling does not add database load.
+"""
+
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+
+from .schema import check_schema, is_schema_ready
+
+
+DEFAULT_HEALTH_CACHE_SECONDS = 5
+
+# نتائج الفحوصات الأخيرة في هذه العملية: الاسم -> (وقت الانتهاء، النتيجة)
+_probe_results = {}
+
+
+def _timed(probe):
+    started = time.perf_counter()
+    try:
+        ok, detail = probe()
+    except Exception as e:
+        ok, detail = False, str(e)
+    return {'ok': ok, 'detail': detail, 'ms': round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _cached_probe(name, probe):
+    """تشغيل الفحص أو إرجاع نتيجته المحفوظة إذا كانت حديثة"""
+    now = time.monotonic()
+    cached = _probe_results.get(name)
+    if cached and cached[0] > now:
+        return cached[1]
+    result = _timed(probe)
+    ttl = getattr(settings, 'HEALTH_CACHE_SECONDS', DEFAULT_HEALTH_CACHE_SECONDS)
+    _probe_results[name] = (now + ttl, result)
+    return result
+
+
+def probe_database():
+    """اتصال بقاعدة البيانات (SELECT 1)"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    return True, connection.vendor
+
+
+def probe_migrations():
+    """جميع migrations مطبقة (من نتيجة فحص بدء التشغيل إن وجدت)"""
+    if is_schema_ready():
+        return True, 'ready'
+    ready = check_schema()
+    return ready, 'ready' if ready else 'pending migrations'
+
+
+def probe_cache():
+    """الكتابة في الذاكرة المؤقتة والقراءة منها"""
+    token = uuid.uuid4().hex
+    cache.set('healthz:probe', token, 30)
+    return cache.get('healthz:probe') == token, settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1]
+
+
+READINESS_PROBES = {
+    'database': probe_database,
+    'migrations': probe_migrations,
+    'cache': probe_cache,
+}
+
+
+def healthz(request):
+    """فحص الحياة: العملية تستجيب (بدون أي اتصال خارجي)"""
+    return JsonResponse({'status': 'ok'})
+
+
+def readyz(request):
+    """فحص الجاهزية: قاعدة البيانات والمخطط والذاكرة المؤقتة"""
+    checks = {name: _cached_probe(name, probe) for name, probe in READINESS_PROBES.items()}
+    ready = all(check['ok'] for check in checks.values())
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'checks': checks},
+        status=200 if ready else 503
+    )
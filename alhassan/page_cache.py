@@ -0,0 +1,96 @@
+"""
+تخزين الصفحات الثابتة - منصة المسابقات الرياضية
+Caches the rendered shell of pages whose content never changes (landing,
+login and error pages) once per process. Only the CSRF token differs between
+responses: the shell is rendered with a placeholder, and each response swaps
+in the token for the current request. ETag and Last-Modified are sent so that
+browsers revalidate with a cheap 304 instead of downloading the page again.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+CSRF_PLACEHOLDER = 'csrf-token-placeholder-5c1e9b'
+
+DEFAULT_MAX_AGE = 300
+
+
+@dataclass(frozen=True)
+class PageShell:
+    content: bytes
+    etag: str
+    last_modified: float
+
+
+_shells = {}
+
+
+def get_shell(key, build, source=None):
+    """الصفحة المخزنة للمفتاح key، تُبنى مرة واحدة في كل عملية باستدعاء build()"""
+    shell = _shells.get(key)
+    if shell is None:
+        content = build()
+        if isinstance(content, str):
+            content = content.encode()
+        shell = PageShell(
+            content=content,
+            etag=hashlib.md5(content).hexdigest()[:16],
+            # وقت تعديل ملف المصدر (ثابت بين العمليات على نفس النشر)
+            last_modified=os.path.getmtime(source) if source else 0,
+        )
+        # في وضع التطوير تُعاد قراءة القوالب في كل طلب
+        if not settings.DEBUG:
+            _shells[key] = shell
+    return shell
+
+
+def cached_page(request, key, build, source=None, status=200, csrf=False, max_age=DEFAULT_MAX_AGE):
+    """استجابة من الصفحة المخزنة مع رمز CSRF جديد وترويسات التخزين
+
+    الصفحات التي تحتوي على نموذج (csrf=True) تُخزن في المتصفح فقط وتُتحقق في كل
+    مرة، ويتضمن ETag بصمة كوكي CSRF حتى لا يُعاد استخدام صفحة برمز قديم.
+    """
+    shell = get_shell(key, build, source)
+    etag = shell.etag
+    token = None
+    if csrf:
+        token = get_token(request)
+        secret = request.META.get('CSRF_COOKIE', '')
+        etag = f'{etag}-{hashlib.md5(secret.encode()).hexdigest()[:8]}'
+    etag = f'"{etag}"'
+
+    if status == 200:
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=shell.last_modified or None
+        )
+        if not_modified is not None:
+            return _cache_headers(not_modified, shell, etag, csrf, max_age)
+
+    content = shell.content
+    if token:
+        content = content.replace(CSRF_PLACEHOLDER.encode(), token.encode())
+
+    response = HttpResponse(content, status=status)
+    if status == 200:
+        _cache_headers(response, shell, etag, csrf, max_age)
+    return response
+
+
+def _cache_headers(response, shell, etag, csrf, max_age):
+    response['ETag'] = etag
+    if shell.last_modified:
+        response['Last-Modified'] = http_date(shell.last_modified)
+    if csrf:
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Cookie'])
+    else:
+        response['Cache-Control'] = f'public, max-age={max_age}'
+    return response
@@ -0,0 +1,96 @@
+"""
+جاهزية مخطط قاعدة البيانات - منصة المسابقات الرياضية
+One-time startup check that the database schema matches the migrations on
+disk. It works on every backend (it reads django_migrations through the
+migration executor instead of probing sqlite_master). The result is cached
+under a key built from the latest migration of each app, so after a deploy
+only the first process checks and the rest read the flag from the cache.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_READY_CACHE_TIMEOUT = 60 * 60 * 24
+
+_schema_ready = None
+
+
+@lru_cache(maxsize=None)
+def schema_version(database=DEFAULT_DB_ALIAS):
+    """معرّف إصدار المخطط من آخر migration لكل تطبيق (من الملفات فقط، بدون قاعدة البيانات)"""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    leaves = sorted(f'{app}.{name}' for app, name in loader.graph.leaf_nodes())
+    return hashlib.sha1('|'.join(leaves).encode()).hexdigest()[:16]
+
+
+def schema_cache_key(database=DEFAULT_DB_ALIAS):
+    return f'schema-ready:{database}:{schema_version(database)}'
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """قائمة migrations غير المطبقة (استعلام واحد على جدول django_migrations)"""
+    executor = MigrationExecutor(connections[database])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f'{migration.app_label}.{migration.name}' for migration, _ in plan]
+
+
+def check_schema(database=DEFAULT_DB_ALIAS):
+    """التحقق من جاهزية المخطط وتسجيل النتيجة في الذاكرة المؤقتة"""
+    global _schema_ready
+
+    key = schema_cache_key(database)
+    if cache.get(key):
+        _schema_ready = True
+        return True
+
+    try:
+        pending = pending_migrations(database)
+        if pending and getattr(settings, 'SCHEMA_AUTO_MIGRATE', False):
+            _migrate(database)
+            pending = pending_migrations(database)
+    except Exception as e:
+        logger.warning('تعذر التحقق من مخطط قاعدة البيانات: %s', e)
+        _schema_ready = False
+        return False
+
+    _schema_ready = not pending
+    if _schema_ready:
+        cache.set(key, True, SCHEMA_READY_CACHE_TIMEOUT)
+    else:
+        logger.warning('قاعدة البيانات تحتاج إلى migrations: %s (شغّل python manage.py migrate)',
+                       ', '.join(pending))
+    return _schema_ready
+
+
+def is_schema_ready():
+    """نتيجة فحص بدء التشغيل (None إذا لم يُجرَ الفحص بعد)"""
+    return _schema_ready
+
+
+def _migrate(database):
+    """تطبيق migrations عند بدء التشغيل فقط (SCHEMA_AUTO_MIGRATE=True)"""
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+
+    logger.info('تطبيق migrations عند بدء التشغيل...')
+    call_command('migrate', database=database, verbosity=0, interactive=False)
+
+    # إنشاء مدير إذا لم يكن موجود
+    if not User.objects.using(database).filter(is_superuser=True).exists():
+        User.objects.db_manager(database).create_superuser(
+            username='admin',
+            email='admin@mathcompetition.com',
+            password='admin123456',
+            first_name='مدير',
+            last_name='النظام'
+        )
@@ -0,0 +1,33 @@
+"""
+إعدادات المشروع - منصة المسابقات الرياضية
+Layered settings: base.py holds everything shared, and one profile adds the
+environment on top of it.
+
+    development   (default) DEBUG, Django's default SQLite settings,
+                  per-process cache
+    production    cached templates, tuned SQLite or pooled
+                  PostgreSQL (DATABASE_URL), shared file cache, WhiteNoise
+                  with compressed manifest static files
+    render        production plus the Render hosts
+
+DJANGO_SETTINGS_MODULE=alhassan.settings picks the profile from DJANGO_ENV.
+Deployments set DJANGO_ENV=production (Dockerfile, Procfile, start.sh,
+deploy.sh, .replit) or render (render.yaml); a bare manage.py call stays on the
+development profile, so it never switches the local db.sqlite3 to WAL or
+needs collectstatic.
+A profile can also be named directly, e.g. alhassan.settings.render. The old
+alhassan.render_settings and top-level render_settings modules re-export
+the render profile.
+"""
+
+import os
+
+
+_profile = os.environ.get('DJANGO_ENV', 'development').lower()
+
+if _profile == 'production':
+    from .production import *  # noqa: F401,F403
+elif _profile == 'render':
+    from .render import *  # noqa: F401,F403
+else:
+    from .development import *  # noqa: F401,F403
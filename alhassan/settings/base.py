@@ -1,7 +1,9 @@
 """
-Django settings for alhassan project.
+Django settings for alhassan project - shared base.
 
-Generated by 'django-admin startproject' using Django 4.2.
+Everything that does not depend on the environment lives here. The
+profiles (development.py, production.py, render.py) import it and add
+their own values. See alhassan/settings/__init__.py.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/topics/settings/
@@ -11,10 +13,14 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
+from alhassan.cache_config import build_caches, session_engine
+from alhassan.db_config import sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
@@ -24,7 +30,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-development-key-change-in-production')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
+DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0']
 
@@ -45,9 +51,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'alhassan.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'alhassan.middleware.DatabaseSetupMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'alhassan.middleware.StudentProgressMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -62,8 +70,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
+        'APP_DIRS': False,
         'OPTIONS': {
+            # القوالب تُحلل مرة واحدة لكل عملية (يُعاد تحميلها تلقائياً مع runserver)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -80,11 +95,10 @@ WSGI_APPLICATION = 'alhassan.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SQLite بملف الإنتاج (WAL ومهلة انتظار القفل واتصالات دائمة)؛ SQLITE_PROFILE=default لإعدادات Django الافتراضية
+# ملف الإنتاج يستخدم PostgreSQL بدلاً منها إذا وُجد DATABASE_URL
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
 }
 
 
@@ -144,10 +158,37 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Student access code
 STUDENT_ACCESS_CODE = os.environ.get('STUDENT_ACCESS_CODE', 'ben25')
 
-# Error handlers
-handler500 = 'alhassan.error_handlers.handler500'
-handler404 = 'alhassan.error_handlers.handler404'
+# الذاكرة المؤقتة والجلسات (انظر alhassan/cache_config.py)
+CACHES = build_caches()
+SESSION_ENGINE = session_engine()
+SESSION_CACHE_ALIAS = 'sessions'
+
+# تخزين تقدم الطالب: 'session' أو 'signed_cookie' (كوكي موقّع بدون أي جلسة على الخادم)
+STUDENT_PROGRESS_BACKEND = os.environ.get('STUDENT_PROGRESS_BACKEND', 'session')
+
+# مدة جلسة الطالب بالثواني (تنتهي بعدها الجلسة وتُعتبر جلسة الطالب غير نشطة)
+STUDENT_SESSION_AGE = int(os.environ.get('STUDENT_SESSION_AGE', 4 * 60 * 60))
+
+# تخزين مسابقات النظام الطارئ بدون قاعدة بيانات: 'file' (مشترك بين العمال) أو 'memory'
+EMERGENCY_STORAGE = os.environ.get('EMERGENCY_STORAGE', 'file')
+EMERGENCY_STORAGE_DIR = os.environ.get(
+    'EMERGENCY_STORAGE_DIR', os.path.join(tempfile.gettempdir(), 'alhassan-emergency')
+)
+
+# سجل الكتابة المتأخرة للمسابقات أثناء تعذر الوصول لقاعدة البيانات (يُفضل مجلد على قرص دائم)
+ANSWER_JOURNAL_DIR = os.environ.get(
+    'ANSWER_JOURNAL_DIR', os.path.join(tempfile.gettempdir(), 'alhassan-journal')
+)
+ANSWER_JOURNAL_FSYNC = os.environ.get('ANSWER_JOURNAL_FSYNC', 'False').lower() == 'true'
+ANSWER_JOURNAL_REPLAY_INTERVAL = int(os.environ.get('ANSWER_JOURNAL_REPLAY_INTERVAL', 30))
+
+# ترويسة Server-Timing بأزمنة فتح اتصالات قاعدة البيانات والاستعلامات والطلب
+# معطلة افتراضياً: تكشف عدد الاستعلامات وأزمنتها لأي زائر، فتُفعّل بـ SERVER_TIMING=True عند القياس فقط
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'False').lower() == 'true'
+
+# مخزن الأسئلة الجاهزة في الذاكرة: عدد الأسئلة لكل (مستوى، صعوبة، عملية)، و0 لتعطيله
+QUESTION_POOL_SIZE = int(os.environ.get('QUESTION_POOL_SIZE', 50))
+QUESTION_POOL_PREWARM = os.environ.get('QUESTION_POOL_PREWARM', 'True').lower() == 'true'
 
-# Debug mode
-DEBUG = False
-ALLOWED_HOSTS = ['*']
+# تطبيق migrations تلقائياً عند بدء التشغيل (معطل افتراضياً؛ يتم ذلك في مرحلة البناء/النشر)
+SCHEMA_AUTO_MIGRATE = os.environ.get('SCHEMA_AUTO_MIGRATE', 'False').lower() == 'true'
@@ -0,0 +1,29 @@
+"""
+إعدادات التطوير المحلي - منصة المسابقات الرياضية
+DEBUG on, Django's default SQLite settings (SQLITE_PROFILE=production to
+try the tuned profile locally), a per-process cache and the Server-Timing
+header.
+"""
+
+import os
+
+from alhassan.cache_config import build_caches
+from alhassan.db_config import sqlite_database
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR
+
+
+DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
+
+DATABASES = {
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', os.environ.get('SQLITE_PROFILE', 'default')),
+}
+
+CACHES = build_caches('locmem')
+
+# لا يُبنى مخزن الأسئلة عند كل إعادة تحميل لـ runserver
+QUESTION_POOL_PREWARM = os.environ.get('QUESTION_POOL_PREWARM', 'False').lower() == 'true'
+
+# ترويسة Server-Timing مفعلة محلياً فقط
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'True').lower() == 'true'
@@ -0,0 +1,73 @@
+"""
+إعدادات الإنتاج - منصة المسابقات الرياضية
+Every performance feature on: cached template loaders (base), tuned SQLite
+or pooled PostgreSQL from DATABASE_URL, a cache shared by all workers on
+the host, and WhiteNoise serving compressed, hashed static files.
+
+WhiteNoise is used when it is installed (it is in requirements.txt);
+without it the static files fall back to Django's default storage. With
+it, collectstatic must run on every build: the pages link to the hashed
+names listed in STATIC_ROOT/staticfiles.json.
+"""
+
+import os
+from importlib.util import find_spec
+
+from alhassan.cache_config import build_caches
+from alhassan.db_config import postgres_database
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE
+
+
+ALLOWED_HOSTS = [host for host in os.environ.get('ALLOWED_HOSTS', '*').split(',') if host]
+
+if os.environ.get('DATABASE_URL'):
+    # PostgreSQL مع SSL ومجمع اتصالات لكل عامل (أو اتصالات دائمة)
+    DATABASES = {
+        'default': postgres_database(os.environ.get('DATABASE_URL'))
+    }
+
+# ذاكرة مؤقتة في ملفات مشتركة بين العمال افتراضياً (CACHE_BACKEND=redis لخادم Redis)
+CACHES = build_caches('file')
+
+if find_spec('whitenoise'):
+    # runserver_nostatic قبل staticfiles، وWhiteNoise مباشرة بعد SecurityMiddleware
+    _staticfiles = INSTALLED_APPS.index('django.contrib.staticfiles')
+    INSTALLED_APPS = [*INSTALLED_APPS[:_staticfiles], 'whitenoise.runserver_nostatic', *INSTALLED_APPS[_staticfiles:]]
+    _security = MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1
+    MIDDLEWARE = [*MIDDLEWARE[:_security], 'whitenoise.middleware.WhiteNoiseMiddleware', *MIDDLEWARE[_security:]]
+    # collectstatic يضيف بصمة المحتوى لأسماء الملفات ويضغطها مسبقاً (gzip، وBrotli إذا ثُبتت مكتبته)
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+    }
+    # الملفات ذات البصمة تُرسل بـ Cache-Control: max-age=315360000, public, immutable
+    # ولا تُنشر نسخها بدون بصمة، فكل رابط للملفات الثابتة يمر عبر {% static %}
+    WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
+# Security settings for production
+SECURE_CONTENT_TYPE_NOSNIFF = True
+X_FRAME_OPTIONS = 'DENY'
+
+# Logging configuration
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'INFO',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
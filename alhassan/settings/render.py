@@ -0,0 +1,22 @@
+"""
+إعدادات Render للنشر - منصة المسابقات الرياضية
+Render deployment settings: the production profile plus Render's hosts.
+"""
+
+from .production import *  # noqa: F401,F403
+
+
+# Allowed hosts for Render
+ALLOWED_HOSTS = [
+    '.onrender.com',
+    'localhost',
+    '127.0.0.1',
+    '0.0.0.0',
+]
+
+# CSRF trusted origins
+CSRF_TRUSTED_ORIGINS = [
+    'https://*.onrender.com',
+    'http://localhost:8000',
+    'http://127.0.0.1:8000',
+]
@@ -0,0 +1,77 @@
+"""
+توقيت الطلبات - منصة المسابقات الرياضية
+Per-request timings reported in the Server-Timing response header, so they
+show up in the browser's network panel and in any proxy that logs it:
+
+    db-connect  opening database connections: a fresh connect with TLS and
+                session setup, or a checkout from the connection pool
+    db          running queries, with the query count
+    app         the whole Django handler
+
+ServerTimingMiddleware (alhassan/middleware.py) starts and reports the
+timings. The header exposes query counts and timings to every client, so
+it is off unless SERVER_TIMING=True (the development profile turns it
+on). Connection time comes from TimedConnectMixin in the database backends
+under alhassan.db_backends.
+"""
+
+import threading
+import time
+
+
+_local = threading.local()
+
+
+class RequestTimings:
+    """أزمنة طلب واحد بالمللي ثانية"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect_ms = 0.0
+        self.connects = 0
+        self.query_ms = 0.0
+        self.queries = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """يُمرر إلى connection.execute_wrapper لقياس زمن الاستعلامات"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_ms += (time.perf_counter() - started) * 1000
+            self.queries += 1
+
+    def header(self):
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return ', '.join([
+            f'db-connect;dur={self.connect_ms:.1f};desc="{self.connects} connect"',
+            f'db;dur={self.query_ms:.1f};desc="{self.queries} queries"',
+            f'app;dur={total_ms:.1f}',
+        ])
+
+
+def start():
+    _local.timings = RequestTimings()
+    return _local.timings
+
+
+def stop():
+    _local.timings = None
+
+
+def current():
+    return getattr(_local, 'timings', None)
+
+
+class TimedConnectMixin:
+    """قياس زمن فتح كل اتصال جديد بقاعدة البيانات وإضافته لأزمنة الطلب الحالي"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            timings = current()
+            if timings is not None:
+                timings.connect_ms += (time.perf_counter() - started) * 1000
+                timings.connects += 1
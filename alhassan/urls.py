@@ -18,58 +18,14 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import HttpResponse
-from . import setup_views, emergency_views
+from django.template.loader import get_template
+from . import health, setup_views, emergency_views
+from .page_cache import cached_page
 
 def home_view(request):
     """Home page with navigation"""
-    return HttpResponse("""
-    <!DOCTYPE html>
-    <html dir="rtl" lang="ar">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>منصة المسابقات الرياضية</title>
-        <style>
-            body { font-family: Arial, sans-serif; text-align: center; padding: 50px; background: #f5f5f5; }
-            .container { max-width: 600px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-            h1 { color: #2c3e50; margin-bottom: 10px; }
-            h2 { color: #34495e; margin-bottom: 30px; }
-            .btn { display: inline-block; padding: 15px 30px; margin: 10px; background: #3498db; color: white; text-decoration: none; border-radius: 5px; font-size: 16px; }
-            .btn:hover { background: #2980b9; }
-            .btn.admin { background: #e74c3c; }
-            .btn.admin:hover { background: #c0392b; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🧮 منصة المسابقات الرياضية</h1>
-            <h2>Math Competition Platform</h2>
-            <p>مرحباً بكم في منصة المسابقات الرياضية التفاعلية</p>
-
-            <div style="margin: 30px 0;">
-                <a href="/accounts/student/login/" class="btn">🎓 دخول الطلاب</a>
-                <a href="/accounts/login/" class="btn">👨‍🏫 دخول المعلمين</a>
-                <a href="/admin/" class="btn admin">⚙️ لوحة الإدارة</a>
-            </div>
-
-            <div style="margin: 20px 0;">
-                <a href="/emergency/" class="btn" style="background: #e74c3c;">🚨 النظام الطارئ</a>
-                <a href="/emergency/student/" class="btn" style="background: #f39c12;">🎓 دخول طلاب طارئ</a>
-            </div>
-
-            <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-top: 30px;">
-                <p style="color: #2c3e50; margin: 5px 0;">
-                    <strong>🎓 للطلاب:</strong> رمز الدخول: <span style="background: #3498db; color: white; padding: 2px 8px; border-radius: 4px;">ben25</span>
-                </p>
-                <p style="color: #2c3e50; margin: 5px 0;">
-                    <strong>👨‍🏫 للمعلمين:</strong> استخدم حساب المدير المُنشأ
-                </p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
+    template = get_template('home.html')
+    return cached_page(request, 'home', template.render, source=template.origin.name)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -79,6 +35,8 @@ urlpatterns = [
     path('dashboard/', include('dashboard.urls')),
     path('setup/', setup_views.setup_system, name='setup_system'),
     path('status/', setup_views.check_system_status, name='system_status'),
+    path('healthz', health.healthz, name='healthz'),
+    path('readyz', health.readyz, name='readyz'),
     # النظام الطارئ - يعمل بدون قاعدة بيانات
     path('emergency/', emergency_views.emergency_setup, name='emergency_setup'),
     path('emergency/student/', emergency_views.emergency_student_login, name='emergency_student'),
@@ -86,6 +44,10 @@ urlpatterns = [
     path('emergency/check/', emergency_views.emergency_check_answer, name='emergency_check'),
 ]
 
+# Error handlers (يقرؤها Django من URLconf الجذري فقط)
+handler500 = 'alhassan.error_handlers.handler500'
+handler404 = 'alhassan.error_handlers.handler404'
+
 # Serve media files during development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -2,15 +2,27 @@
 WSGI config for alhassan project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+The worker's boot time (settings, apps and middleware) is logged once, so
+startup regressions show up in the deploy logs; benchmark_cold_start
+measures it across runs and profiles.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
+import time
 
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'alhassan.settings')
 
+_started = time.perf_counter()
 application = get_wsgi_application()
+
+logging.getLogger(__name__).info(
+    'Worker %s ready in %.1f ms (%s, DJANGO_ENV=%s)',
+    os.getpid(), (time.perf_counter() - _started) * 1000,
+    os.environ['DJANGO_SETTINGS_MODULE'], os.environ.get('DJANGO_ENV', 'development'),
+)
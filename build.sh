@@ -18,11 +18,16 @@ mkdir -p static
 
 echo "📁 جمع الملفات الثابتة..."
 echo "Collecting static files..."
-python manage.py collectstatic --noinput --clear || echo "Static files collection failed, continuing..."
+# الصفحات تشير إلى أسماء الملفات ذات البصمة، فلا يكتمل البناء بدونها
+python manage.py collectstatic --noinput --clear
 
 echo "📊 تطبيق هجرات قاعدة البيانات..."
 echo "Applying database migrations..."
 python manage.py migrate --noinput
 
+echo "🏦 تعبئة بنك الأسئلة (مرة واحدة لكل نشر، وليس في كل عامل)..."
+echo "Seeding the question bank..."
+python manage.py build_question_bank --top-up
+
 echo "✅ اكتمل البناء بنجاح!"
 echo "Build completed successfully!"
@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
-# Simple build script for Render - No collectstatic
-# سكريبت بناء مبسط بدون collectstatic
+# Simple build script for Render - minimal requirements only
+# سكريبت بناء مبسط بالمتطلبات الأساسية فقط
 
 set -o errexit
 
@@ -11,6 +11,10 @@ echo "📦 تثبيت Django والمتطلبات الأساسية..."
 echo "Installing Django and basic requirements..."
 pip install Django==5.2.1 gunicorn==21.2.0 whitenoise==6.6.0
 
+echo "📁 جمع الملفات الثابتة..."
+echo "Collecting static files..."
+python manage.py collectstatic --noinput --clear
+
 echo "📊 تطبيق هجرات قاعدة البيانات..."
 echo "Applying database migrations..."
 python manage.py migrate --noinput || echo "Migration failed, continuing..."
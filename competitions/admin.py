@@ -9,12 +9,29 @@ class QuestionAdmin(admin.ModelAdmin):
     search_fields = ['question_text']
 
 
+class AnswerInline(admin.TabularInline):
+    """إجابات المسابقة (للعرض فقط)"""
+    model = Answer
+    fields = ['question', 'student_answer', 'is_correct', 'answer_time']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        # عنوان كل صف (Answer.__str__) يعرض اسم الطالب ونص السؤال
+        return super().get_queryset(request).select_related('competition', 'question')
+
+
 @admin.register(Competition)
 class CompetitionAdmin(admin.ModelAdmin):
     list_display = ['student_name', 'grade_level', 'start_time', 'is_completed', 'score']
     list_filter = ['grade_level', 'is_completed', 'start_time']
     search_fields = ['student_name']
     readonly_fields = ['start_time', 'score']
+    inlines = [AnswerInline]
 
 
 @admin.register(Answer)
@@ -22,3 +39,5 @@ class AnswerAdmin(admin.ModelAdmin):
     list_display = ['competition', 'question', 'student_answer', 'is_correct', 'answer_time']
     list_filter = ['is_correct', 'answer_time']
     search_fields = ['competition__student_name']
+    list_select_related = ['competition', 'question']
+    raw_id_fields = ['competition', 'question']
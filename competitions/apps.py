@@ -1,7 +1,27 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+
+
+BACKGROUND_WORK_UID = 'competitions.start_background_work'
+
+
+def start_background_work(sender, **kwargs):
+    """أول طلب في العملية: تعبئة مخزن الأسئلة وإعادة تشغيل السجل المتبقي من عامل سابق"""
+    request_started.disconnect(dispatch_uid=BACKGROUND_WORK_UID)
+
+    from .journal import replay_on_boot
+    from .pool import prewarm_on_boot
+
+    prewarm_on_boot()
+    replay_on_boot()
 
 
 class CompetitionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'competitions'
     verbose_name = 'المسابقات الرياضية'
+
+    def ready(self):
+        # خيوط الخلفية تستخدم قاعدة البيانات، فتبدأ مع أول طلب في كل عملية (بعد fork
+        # عند gunicorn) وليس أثناء تهيئة التطبيقات
+        request_started.connect(start_background_work, dispatch_uid=BACKGROUND_WORK_UID)
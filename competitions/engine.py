@@ -0,0 +1,569 @@
+"""
+محرك المسابقة - منصة المسابقات الرياضية
+One competition engine for the normal and the emergency student flows.
+
+The engine owns the rules: drawing the questions, the current question,
+checking an answer on the server, grading a whole batch, completing and
+scoring. A storage backend only keeps the competition state:
+
+    DatabaseStorage  Competition/Answer rows (the normal flow)
+    MemoryStorage    a per-process dict, no database at all
+    FileStorage      one JSON file per competition, shared by the workers
+                     of one host (updates hold an flock on <id>.lock), no
+                     database at all
+    JournaledStorage FileStorage that also appends every change to the
+                     write-behind journal (competitions/journal.py), used
+                     by the normal flow while the database is unreachable,
+                     for new competitions and for running ones it takes
+                     over (take_over)
+
+The emergency views use get_emergency_storage(), chosen by the
+EMERGENCY_STORAGE setting ('file' or 'memory'). storage_for() routes a
+competition id to its storage: database ids are integers, journaled ids
+are hex strings.
+"""
+
+import json
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .generator import generate_questions, new_seed
+
+try:
+    import fcntl
+except ImportError:  # Windows: بدون أقفال ملفات
+    fcntl = None
+
+
+TOTAL_QUESTIONS = 10
+
+# تقديرات النتيجة: (الحد الأدنى، لون الخلفية، التقدير، النصيحة)
+SCORE_BANDS = [
+    (90, '#d4edda', '🌟 ممتاز جداً!', 'أداء رائع! استمر في التدريب للحفاظ على هذا المستوى الممتاز.'),
+    (80, '#d4edda', '🎉 ممتاز!', 'أداء رائع! استمر في التدريب للحفاظ على هذا المستوى الممتاز.'),
+    (70, '#fff3cd', '👍 جيد جداً', 'أداء جيد! مع المزيد من التدريب ستصل للامتياز.'),
+    (60, '#fff3cd', '👌 جيد', 'أداء جيد! مع المزيد من التدريب ستصل للامتياز.'),
+    (50, '#f8d7da', '📈 مقبول', 'لا تيأس! التدريب المستمر سيحسن من أدائك. جرب مرة أخرى.'),
+    (0, '#f8d7da', '💪 يحتاج تحسين', 'لا تيأس! التدريب المستمر سيحسن من أدائك. جرب مرة أخرى.'),
+]
+
+
+class AnswerRejected(Exception):
+    """إجابة مرفوضة: السؤال أُجيب عليه مسبقاً أو المسابقة صُححت"""
+
+
+def score_band(score):
+    """تقدير النتيجة (يُحسب مرة واحدة في العرض بدلاً من سلاسل if في القالب)"""
+    for minimum, background, title, tip in SCORE_BANDS:
+        if score >= minimum:
+            break
+    return {'background': background, 'title': title, 'tip': tip}
+
+
+def calculate_score(correct_answers, total_questions):
+    if total_questions > 0:
+        return (correct_answers / total_questions) * 100
+    return 0.0
+
+
+# ---------------------------------------------------------------------------
+# قواعد المسابقة (مستقلة عن التخزين)
+# ---------------------------------------------------------------------------
+
+def start_competition(storage, student_name, grade_level, difficulty_level, total_questions=TOTAL_QUESTIONS):
+    """إنشاء مسابقة جديدة بأسئلتها في التخزين المحدد"""
+    from .question_bank import normalize_difficulty
+
+    return storage.create(student_name, grade_level, normalize_difficulty(difficulty_level), total_questions)
+
+
+def current_question(storage, state):
+    """(رقم السؤال، السؤال) للسؤال التالي، أو None إذا أُجيب على جميع الأسئلة"""
+    if state.answered_count >= state.total_questions:
+        return None
+    return state.answered_count + 1, storage.question(state, state.answered_count)
+
+
+def submit_answer(storage, state, question_number, student_answer):
+    """تصحيح إجابة السؤال الحالي على الخادم
+
+    السؤال يُحدد من حالة المسابقة، ولا يُقبل من النموذج سوى رقمه والإجابة.
+    """
+    answered_count = state.answered_count
+    if answered_count >= state.total_questions or str(question_number) != str(answered_count + 1):
+        raise AnswerRejected('تمت الإجابة على هذا السؤال مسبقاً')
+
+    question = storage.question(state, answered_count)
+    is_correct = student_answer == question['answer']
+    if not storage.record_answer(state, answered_count, question, student_answer, is_correct):
+        raise AnswerRejected('تمت الإجابة على هذا السؤال مسبقاً')
+
+    return {'correct': is_correct, 'correct_answer': question['answer']}
+
+
+def submit_all(storage, state, answers):
+    """تصحيح جميع إجابات المسابقة دفعة واحدة وإنهاؤها بكتابة واحدة"""
+    if state.is_completed or state.answered_count:
+        raise AnswerRejected('تم إرسال إجابات هذه المسابقة مسبقاً')
+
+    questions = [storage.question(state, index) for index in range(state.total_questions)]
+    answers = list(answers) + [None] * (len(questions) - len(answers))
+
+    graded = []
+    for question, student_answer in zip(questions, answers):
+        try:
+            student_answer = int(student_answer)
+        except (TypeError, ValueError):
+            student_answer = 0
+        graded.append((question, student_answer, student_answer == question['answer']))
+
+    if not storage.record_all(state, graded):
+        raise AnswerRejected('تم إرسال إجابات هذه المسابقة مسبقاً')
+
+    return {
+        'correct_answers': state.correct_answers,
+        'total_questions': state.total_questions,
+        'score': state.score,
+        'results': [
+            {'correct': is_correct, 'correct_answer': question['answer']}
+            for question, _, is_correct in graded
+        ],
+    }
+
+
+def finish(storage, state):
+    """إنهاء المسابقة وحساب النتيجة؛ تُعيد True فقط للطلب الذي أنهاها فعلاً"""
+    if state.is_completed:
+        return False
+    return storage.complete(state)
+
+
+def results_context(state):
+    """سياق قالب النتائج المشترك بين المسارين"""
+    return {
+        'competition': state,
+        'percentage': state.score,
+        'band': score_band(state.score),
+        'wrong_answers': state.total_questions - state.correct_answers,
+    }
+
+
+# ---------------------------------------------------------------------------
+# التخزين في قاعدة البيانات (المسار العادي)
+# ---------------------------------------------------------------------------
+
+class DatabaseStorage:
+    """حالة المسابقة في صفوف Competition و Answer"""
+
+    def get(self, competition_id):
+        from .models import Competition
+
+        if competition_id is None:
+            return None
+        return Competition.objects.filter(id=competition_id).first()
+
+    def create(self, student_name, grade_level, difficulty, total_questions):
+        from dashboard.stats import record_competition_started
+        from .models import Competition
+        from .pool import get_pool
+        from .question_bank import draw_competition_questions
+
+        # أسئلة جاهزة من المخزن في الذاكرة أو مسحوبة من البنك
+        seed = None
+        questions = get_pool().take_competition(grade_level, difficulty, total_questions)
+        if questions is None:
+            # المخزن فارغ: توليد الأسئلة من بذرة جديدة تُحفظ مع المسابقة
+            seed = new_seed()
+            questions = draw_competition_questions(grade_level, difficulty, total_questions, seed)
+        competition = Competition.objects.create(
+            student_name=student_name,
+            grade_level=grade_level,
+            difficulty=difficulty,
+            total_questions=total_questions,
+            seed=seed,
+            questions=questions
+        )
+        record_competition_started()
+        return competition
+
+    def question(self, competition, index):
+        """سؤال المسابقة رقم index من الأسئلة المحفوظة على الخادم"""
+        from .question_bank import draw_competition_questions
+
+        if not competition.questions:
+            # مسابقات قديمة أُنشئت قبل حفظ الأسئلة مع المسابقة، أو أسئلة تُعاد من البذرة
+            if competition.seed is None:
+                competition.seed = new_seed()
+            competition.questions = draw_competition_questions(
+                competition.grade_level, competition.difficulty, competition.total_questions, competition.seed
+            )
+            competition.save(update_fields=['questions', 'seed'])
+        return competition.questions[index]
+
+    def record_answer(self, competition, answered_count, question, student_answer, is_correct):
+        from .models import Answer
+
+        # تحديث العدادات ذرياً ثم حفظ الإجابة
+        with transaction.atomic():
+            if not competition.record_answer(answered_count, is_correct):
+                return False
+            Answer.objects.create(
+                competition=competition,
+                question_id=question['id'],
+                student_answer=student_answer,
+                is_correct=is_correct
+            )
+        return True
+
+    def record_all(self, competition, graded):
+        from dashboard.stats import record_competition_completed
+        from .models import Answer, Competition
+
+        competition.correct_answers = sum(1 for _, _, is_correct in graded if is_correct)
+        competition.end_time = timezone.now()
+        competition.calculate_score()
+
+        with transaction.atomic():
+            # تحديث واحد مشروط يمنع تصحيح المسابقة مرتين عند تكرار الإرسال
+            updated = Competition.objects.filter(
+                id=competition.id, is_completed=False, answered_count=0
+            ).update(
+                correct_answers=competition.correct_answers,
+                answered_count=len(graded),
+                is_completed=True,
+                end_time=competition.end_time,
+                score=competition.score
+            )
+            if not updated:
+                return False
+            Answer.objects.bulk_create([
+                Answer(
+                    competition=competition,
+                    question_id=question['id'],
+                    student_answer=student_answer,
+                    is_correct=is_correct
+                )
+                for question, student_answer, is_correct in graded
+            ])
+            record_competition_completed(competition)
+
+        competition.answered_count = len(graded)
+        competition.is_completed = True
+        return True
+
+    def complete(self, competition):
+        from dashboard.stats import record_competition_completed
+
+        # تحديث إحصائيات لوحة التحكم مرة واحدة فقط
+        if not competition.complete():
+            return False
+        record_competition_completed(competition)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# التخزين بدون قاعدة بيانات (النظام الطارئ)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CompetitionState:
+    """حالة مسابقة خارج قاعدة البيانات بنفس أسماء حقول Competition"""
+    id: str
+    student_name: str
+    grade_level: str
+    difficulty: str
+    total_questions: int
+    questions: list
+    seed: int = None
+    answered_count: int = 0
+    correct_answers: int = 0
+    is_completed: bool = False
+    score: float = 0.0
+    answers: list = field(default_factory=list)
+
+    def calculate_score(self):
+        self.score = calculate_score(self.correct_answers, self.total_questions)
+        return self.score
+
+
+class StateStorage:
+    """أساس التخزين بدون قاعدة بيانات: الأسئلة من المولد مباشرة، والحفظ في load/save"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def load(self, competition_id):
+        raise NotImplementedError
+
+    def save(self, state):
+        raise NotImplementedError
+
+    def get(self, competition_id):
+        if not competition_id:
+            return None
+        return self.load(str(competition_id))
+
+    def create(self, student_name, grade_level, difficulty, total_questions):
+        seed = new_seed()
+        state = CompetitionState(
+            id=secrets.token_hex(8),
+            student_name=student_name,
+            grade_level=grade_level,
+            difficulty=difficulty,
+            total_questions=total_questions,
+            seed=seed,
+            # العملية والأعداد تُحفظ أيضاً ليُدرج السؤال في البنك عند إعادة تشغيل السجل
+            questions=[
+                {
+                    'id': None,
+                    'text': generated['text'],
+                    'answer': generated['answer'],
+                    'operation_type': generated['operation_type'],
+                    'operands': generated['operands'],
+                }
+                for generated in generate_questions(seed, difficulty, total_questions)
+            ],
+        )
+        self.save(state)
+        return state
+
+    def question(self, state, index):
+        return state.questions[index]
+
+    @contextmanager
+    def locked(self, competition_id):
+        """قفل قراءة-فحص-كتابة حالة مسابقة واحدة"""
+        with self._lock:
+            yield
+
+    def _update(self, state, apply):
+        """تطبيق تعديل على أحدث نسخة محفوظة ثم نسخها إلى state؛ apply تُعيد False للرفض"""
+        with self.locked(state.id):
+            current = self.load(state.id) or state
+            if apply(current) is False:
+                return False
+            self.save(current)
+        state.__dict__.update(current.__dict__)
+        return True
+
+    def record_answer(self, state, answered_count, question, student_answer, is_correct):
+        def apply(current):
+            if current.answered_count != answered_count:
+                return False
+            current.answered_count += 1
+            current.correct_answers += int(is_correct)
+            current.answers.append({
+                'question': question['text'],
+                'student_answer': student_answer,
+                'is_correct': is_correct,
+            })
+
+        return self._update(state, apply)
+
+    def record_all(self, state, graded):
+        def apply(current):
+            if current.is_completed or current.answered_count:
+                return False
+            current.answers = [
+                {'question': question['text'], 'student_answer': student_answer, 'is_correct': is_correct}
+                for question, student_answer, is_correct in graded
+            ]
+            current.answered_count = len(graded)
+            current.correct_answers = sum(1 for _, _, is_correct in graded if is_correct)
+            current.is_completed = True
+            current.calculate_score()
+
+        return self._update(state, apply)
+
+    def complete(self, state):
+        def apply(current):
+            if current.is_completed:
+                return False
+            current.is_completed = True
+            current.calculate_score()
+
+        return self._update(state, apply)
+
+
+class MemoryStorage(StateStorage):
+    """مسابقات في ذاكرة العملية (تضيع عند إعادة التشغيل ولا تُشارك بين العمال)"""
+
+    def __init__(self):
+        super().__init__()
+        self._states = {}
+
+    def load(self, competition_id):
+        state = self._states.get(competition_id)
+        return CompetitionState(**asdict(state)) if state else None
+
+    def save(self, state):
+        self._states[state.id] = CompetitionState(**asdict(state))
+
+
+class FileStorage(StateStorage):
+    """ملف JSON لكل مسابقة في مجلد واحد يشترك فيه جميع العمال على نفس الخادم"""
+
+    ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, competition_id):
+        return os.path.join(self.directory, f'{competition_id}.json')
+
+    def load(self, competition_id):
+        if not self.ID_PATTERN.match(competition_id):
+            return None
+        try:
+            with open(self._path(competition_id), encoding='utf-8') as handle:
+                return CompetitionState(**json.load(handle))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    @contextmanager
+    def locked(self, competition_id):
+        # flock على ملف قفل ثابت (ملف الحالة يُستبدل عند كل حفظ) يشمل عمال الخادم الآخرين
+        with super().locked(competition_id):
+            with open(os.path.join(self.directory, f'{competition_id}.lock'), 'a') as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                yield
+
+    def save(self, state):
+        # كتابة ملف مؤقت ثم استبداله حتى لا يقرأ عامل آخر ملفاً ناقصاً
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as handle:
+            json.dump(asdict(state), handle, ensure_ascii=False)
+        os.replace(temporary, self._path(state.id))
+
+    def prune(self, max_age):
+        """حذف ملفات المسابقات التي لم تتغير منذ max_age ثانية؛ تُعيد عدد المحذوف"""
+        cutoff = time.time() - max_age
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+class JournaledStorage(FileStorage):
+    """وضع التشغيل بدون قاعدة بيانات: الحالة في ملفات، وكل تغيير سطر في سجل الكتابة المتأخرة"""
+
+    def __init__(self, directory, journal):
+        super().__init__(directory)
+        self.journal = journal
+
+    def _log(self, event, state, **values):
+        from .journal import get_replayer
+
+        self.journal.append({'event': event, 'competition': state.id, **values})
+        get_replayer().start()
+
+    def create(self, student_name, grade_level, difficulty, total_questions):
+        state = super().create(student_name, grade_level, difficulty, total_questions)
+        self._log(
+            'competition', state,
+            student_name=student_name,
+            grade_level=grade_level,
+            difficulty=difficulty,
+            total_questions=total_questions,
+            seed=state.seed,
+            questions=state.questions,
+        )
+        return state
+
+    def take_over(self, competition):
+        """متابعة مسابقة من قاعدة البيانات في السجل بعد تعذر الكتابة فيها أثناء المسابقة
+
+        الإجابات التالية تُكتب في السجل، وعند إعادة تشغيله تُضاف إلى نفس صف Competition.
+        """
+        state = CompetitionState(
+            id=secrets.token_hex(8),
+            student_name=competition.student_name,
+            grade_level=competition.grade_level,
+            difficulty=competition.difficulty,
+            total_questions=competition.total_questions,
+            questions=competition.questions,
+            seed=competition.seed,
+            answered_count=competition.answered_count,
+            correct_answers=competition.correct_answers,
+        )
+        self.save(state)
+        self._log('competition', state, database_id=competition.id)
+        return state
+
+    def record_answer(self, state, answered_count, question, student_answer, is_correct):
+        if not super().record_answer(state, answered_count, question, student_answer, is_correct):
+            return False
+        self._log('answer', state, index=answered_count, student_answer=student_answer, is_correct=is_correct)
+        return True
+
+    def record_all(self, state, graded):
+        if not super().record_all(state, graded):
+            return False
+        self._log('answers', state, answers=[
+            {'student_answer': student_answer, 'is_correct': is_correct}
+            for _, student_answer, is_correct in graded
+        ])
+        return True
+
+    def complete(self, state):
+        if not super().complete(state):
+            return False
+        self._log('complete', state)
+        return True
+
+
+database_storage = DatabaseStorage()
+
+_emergency_storage = None
+_journaled_storage = None
+
+
+def get_emergency_storage():
+    """تخزين النظام الطارئ حسب الإعداد EMERGENCY_STORAGE (مثيل واحد لكل عملية)"""
+    global _emergency_storage
+    if _emergency_storage is None:
+        if getattr(settings, 'EMERGENCY_STORAGE', 'file') == 'memory':
+            _emergency_storage = MemoryStorage()
+        else:
+            _emergency_storage = FileStorage(getattr(
+                settings, 'EMERGENCY_STORAGE_DIR',
+                os.path.join(tempfile.gettempdir(), 'alhassan-emergency')
+            ))
+    return _emergency_storage
+
+
+def get_journaled_storage():
+    """تخزين المسابقات التي تبدأ أثناء تعذر الوصول لقاعدة البيانات (مثيل واحد لكل عملية)"""
+    global _journaled_storage
+    if _journaled_storage is None:
+        from .journal import get_journal
+
+        journal = get_journal()
+        _journaled_storage = JournaledStorage(os.path.join(journal.directory, 'state'), journal)
+    return _journaled_storage
+
+
+def storage_for(competition_id):
+    """تخزين المسابقة حسب نوع معرفها: رقم في قاعدة البيانات أو نص في السجل"""
+    if isinstance(competition_id, str):
+        return get_journaled_storage()
+    return database_storage
@@ -0,0 +1,136 @@
+"""
+مولد الأسئلة - منصة المسابقات الرياضية
+Shared, seedable question generator. Operand tables are precomputed once per
+difficulty, so drawing an operand is one random() call and a tuple index,
+with no branching on difficulty. A whole competition is drawn in one call from a
+random.Random seeded per competition, so storing the seed is enough to
+regenerate the same questions later.
+
+This module does not touch the database and is safe to use from the
+emergency views.
+"""
+
+import random
+import secrets
+from collections import namedtuple
+
+
+# نطاقات الأعداد لكل مستوى صعوبة (الحدود مشمولة)
+DIFFICULTY_RANGES = {
+    # سهل: أرقام صغيرة
+    'easy': {'add': (1, 20), 'sub': (5, 30), 'mul': (1, 5), 'div': (2, 5)},
+    # متوسط: أرقام متوسطة
+    'medium': {'add': (10, 100), 'sub': (20, 150), 'mul': (2, 15), 'div': (2, 12)},
+    # صعب: أرقام كبيرة
+    'hard': {'add': (50, 200), 'sub': (100, 500), 'mul': (10, 25), 'div': (5, 20)},
+}
+
+OPERATION_TYPES = ('addition', 'subtraction', 'multiplication', 'division')
+
+OperandTable = namedtuple('OperandTable', ['add', 'sub', 'mul', 'divisor', 'quotient'])
+
+
+def _inclusive(bounds):
+    low, high = bounds
+    return tuple(range(low, high + 1))
+
+
+# جداول الأعداد المحسوبة مسبقاً؛ السحب منها فهرسة مباشرة برقم عشوائي واحد
+OPERAND_TABLES = {
+    difficulty: OperandTable(
+        add=_inclusive(ranges['add']),
+        sub=_inclusive(ranges['sub']),
+        mul=_inclusive(ranges['mul']),
+        divisor=_inclusive(ranges['div']),
+        # ناتج القسمة من 1 حتى الحد الأعلى للمقسوم عليه (قسمة بدون باقٍ)
+        quotient=_inclusive((1, ranges['div'][1])),
+    )
+    for difficulty, ranges in DIFFICULTY_RANGES.items()
+}
+
+_random = random.Random()
+
+
+def new_seed():
+    """بذرة جديدة لمسابقة (تتسع في BigIntegerField)"""
+    return secrets.randbits(62)
+
+
+def _pick(rnd, values):
+    return values[int(rnd() * len(values))]
+
+
+def _addition(rnd, table):
+    a, b = _pick(rnd, table.add), _pick(rnd, table.add)
+    return f'{a} + {b}', a + b, a, b
+
+
+def _subtraction(rnd, table):
+    # المطروح لا يتجاوز المطروح منه: لا نتائج سالبة
+    a = _pick(rnd, table.sub)
+    b = 1 + int(rnd() * a)
+    return f'{a} - {b}', a - b, a, b
+
+
+def _multiplication(rnd, table):
+    a, b = _pick(rnd, table.mul), _pick(rnd, table.mul)
+    return f'{a} × {b}', a * b, a, b
+
+
+def _division(rnd, table):
+    # المقسوم = المقسوم عليه × الناتج: قسمة صحيحة دائماً
+    b, answer = _pick(rnd, table.divisor), _pick(rnd, table.quotient)
+    a = b * answer
+    return f'{a} ÷ {b}', answer, a, b
+
+
+OPERATIONS = {
+    'addition': _addition,
+    'subtraction': _subtraction,
+    'multiplication': _multiplication,
+    'division': _division,
+}
+
+
+def _question(difficulty_level, operation_type, text, answer, a, b):
+    return {
+        'text': text,
+        'answer': answer,
+        'difficulty': difficulty_level,
+        'operation_type': operation_type,
+        'operands': (a, b),
+    }
+
+
+def generate_question(difficulty_level='medium', rng=None, operation_type=None):
+    """سؤال واحد: {'text', 'answer', 'difficulty', 'operation_type', 'operands'}"""
+    rnd = (rng or _random).random
+    table = OPERAND_TABLES.get(difficulty_level) or OPERAND_TABLES['medium']
+    operation_type = operation_type or _pick(rnd, OPERATION_TYPES)
+    return _question(difficulty_level, operation_type, *OPERATIONS[operation_type](rnd, table))
+
+
+def generate_questions(seed, difficulty_level='medium', count=10):
+    """أسئلة مسابقة كاملة من بذرة واحدة (نفس البذرة = نفس الأسئلة دائماً)
+
+    الأسئلة غير مكررة داخل المسابقة ما دام نطاق الأعداد يسمح بذلك.
+    """
+    rnd = random.Random(seed).random
+    table = OPERAND_TABLES.get(difficulty_level) or OPERAND_TABLES['medium']
+
+    drawn = {}
+    attempts = 0
+    while len(drawn) < count and attempts < count * 10:
+        attempts += 1
+        operation_type = _pick(rnd, OPERATION_TYPES)
+        text, answer, a, b = OPERATIONS[operation_type](rnd, table)
+        key = (operation_type, a, b)
+        if key not in drawn:
+            drawn[key] = _question(difficulty_level, operation_type, text, answer, a, b)
+
+    questions = list(drawn.values())
+    while len(questions) < count:
+        # نطاق الأعداد صغير جداً: نسمح بالتكرار لإكمال العدد المطلوب
+        operation_type = _pick(rnd, OPERATION_TYPES)
+        questions.append(_question(difficulty_level, operation_type, *OPERATIONS[operation_type](rnd, table)))
+    return questions
@@ -0,0 +1,358 @@
+"""
+سجل الكتابة المتأخرة - منصة المسابقات الرياضية
+Write-behind journal for competitions that run while the database is down
+or locked. Each worker appends one JSON event per line to its own file
+(journal-<host>-<pid>.jsonl):
+
+    {"event": "competition", "competition": id, ...}   the drawn competition
+    {"event": "competition", "competition": id, "database_id": n}
+                                   a running database competition taken over
+    {"event": "answer", "competition": id, "index": n, ...}
+    {"event": "answers", "competition": id, "answers": [...]}   batch mode
+    {"event": "complete", "competition": id, ...}
+
+replay_journal() runs in one process at a time (flock on the directory's
+.replay.lock). It claims the files (rename, then flock so no append is in
+flight), and writes the competitions into the database in batches, one
+transaction per batch. Replay is idempotent: competitions are matched on
+Competition.journal_id and only answers past answered_count are applied,
+so a crash halfway or a competition that spans several files is safe.
+Events that cannot be applied yet (answers whose competition is not known)
+are written back to a fresh journal file before the claimed files are
+removed; after MAX_REQUEUE attempts they are kept in orphaned-*.jsonl for
+a manual look instead of being retried forever.
+
+A daemon thread in each worker retries the replay every
+ANSWER_JOURNAL_REPLAY_INTERVAL seconds while files are pending, and the
+replay_journal management command does the same on demand.
+"""
+
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+try:
+    import fcntl
+except ImportError:  # Windows: بدون أقفال ملفات
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLAY_BATCH = 200
+DEFAULT_REPLAY_INTERVAL = 30
+MAX_REQUEUE = 10
+
+
+def _lock(handle, blocking=True):
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+class Journal:
+    """ملفات JSONL تُضاف إليها الأحداث فقط، ملف لكل عامل"""
+
+    def __init__(self, directory, fsync=False):
+        self.directory = directory
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self):
+        # يُحسب عند كل كتابة لأن العمال يُنشؤون بـ fork بعد تحميل الوحدة
+        return os.path.join(self.directory, f'journal-{socket.gethostname()}-{os.getpid()}.jsonl')
+
+    def append(self, event):
+        """إضافة حدث واحد كسطر JSON"""
+        event['at'] = time.time()
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self._lock:
+            while True:
+                path = self.path
+                with open(path, 'a', encoding='utf-8') as handle:
+                    _lock(handle)
+                    try:
+                        current = os.stat(path).st_ino
+                    except FileNotFoundError:
+                        current = None
+                    if current != os.fstat(handle.fileno()).st_ino:
+                        # نُقل الملف لإعادة التشغيل بعد فتحه: الكتابة في ملف جديد
+                        continue
+                    handle.write(line)
+                    handle.flush()
+                    if self.fsync:
+                        os.fsync(handle.fileno())
+                    return
+
+    def pending(self):
+        """هل توجد أحداث لم تُكتب في قاعدة البيانات بعد؟"""
+        return bool(
+            glob.glob(os.path.join(self.directory, 'journal-*.jsonl'))
+            or glob.glob(os.path.join(self.directory, 'journal-*.replaying'))
+        )
+
+    def replay_lock(self, blocking=True):
+        """قفل على مستوى المجلد: عملية واحدة فقط تعيد تشغيل السجل؛ يُعيد الملف المقفل أو None"""
+        handle = open(os.path.join(self.directory, '.replay.lock'), 'a')
+        if not _lock(handle, blocking):
+            handle.close()
+            return None
+        return handle
+
+    def claim(self):
+        """نقل ملفات السجل جانباً وقفلها؛ تُعيد [(المسار، الملف المفتوح)]
+
+        يُستدعى مع replay_lock فقط، فكل ملف .replaying ملك لهذه العملية.
+        """
+        for path in glob.glob(os.path.join(self.directory, 'journal-*.jsonl')):
+            try:
+                os.rename(path, f'{path[:-len(".jsonl")]}.{time.time_ns()}.replaying')
+            except FileNotFoundError:
+                pass
+
+        claimed = []
+        for path in sorted(glob.glob(os.path.join(self.directory, 'journal-*.replaying'))):
+            handle = open(path, encoding='utf-8')
+            # انتظار أي كتابة بدأت قبل نقل الملف
+            _lock(handle)
+            claimed.append((path, handle))
+        return claimed
+
+    def write_file(self, prefix, events):
+        """كتابة أحداث في ملف جديد كامل (ملف مؤقت ثم إعادة تسمية)"""
+        path = os.path.join(self.directory, f'{prefix}-{socket.gethostname()}-{os.getpid()}-{time.time_ns()}.jsonl')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as handle:
+            for event in events:
+                handle.write(json.dumps(event, ensure_ascii=False) + '\n')
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(f'{path}.tmp', path)
+        return path
+
+
+def read_events(handle):
+    """أحداث ملف واحد؛ يُتجاهل السطر الأخير الناقص إن وُجد"""
+    for line in handle:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            logger.warning('سطر غير صالح في سجل الكتابة المتأخرة: %r', line[:200])
+
+
+def group_events(events):
+    """تجميع الأحداث حسب المسابقة بترتيب ظهورها"""
+    groups = OrderedDict()
+    for event in events:
+        group = groups.setdefault(
+            event['competition'], {'created': None, 'answers': {}, 'completed': None, 'events': []}
+        )
+        group['events'].append(event)
+        if event['event'] == 'competition':
+            group['created'] = event
+        elif event['event'] == 'answer':
+            group['answers'][event['index']] = event
+        elif event['event'] == 'answers':
+            for index, answer in enumerate(event['answers']):
+                group['answers'][index] = answer
+            group['completed'] = event
+        elif event['event'] == 'complete':
+            group['completed'] = event
+    return groups
+
+
+def _datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def _replay_group(journal_id, group, competition):
+    """كتابة مسابقة واحدة من السجل؛ تُعيد عدد الإجابات المضافة أو None إذا لم تكن معروفة"""
+    from dashboard.stats import record_competition_completed, record_competition_started
+    from .models import Answer, Competition
+    from .question_bank import persist_bank_questions
+
+    created = group['created']
+    if competition is None and created is not None and created.get('database_id'):
+        # مسابقة بدأت في قاعدة البيانات وانتقلت إلى السجل أثناء المسابقة
+        competition = Competition.objects.filter(id=created['database_id']).first()
+        if competition is None:
+            return None
+        Competition.objects.filter(id=competition.id).update(journal_id=journal_id)
+    if competition is None:
+        if created is None:
+            return None
+        competition = Competition.objects.create(
+            journal_id=journal_id,
+            student_name=created['student_name'],
+            grade_level=created['grade_level'],
+            difficulty=created['difficulty'],
+            total_questions=created['total_questions'],
+            seed=created['seed'],
+            questions=persist_bank_questions(created['grade_level'], created['difficulty'], created['questions']),
+        )
+        Competition.objects.filter(id=competition.id).update(start_time=_datetime(created['at']))
+        record_competition_started()
+
+    answers = [
+        (index, answer) for index, answer in sorted(group['answers'].items())
+        if index >= competition.answered_count
+    ]
+    Answer.objects.bulk_create([
+        Answer(
+            competition=competition,
+            question_id=competition.questions[index]['id'],
+            student_answer=answer['student_answer'],
+            is_correct=answer['is_correct']
+        )
+        for index, answer in answers
+    ])
+    if answers:
+        # الفهارس قد لا تكون متتالية: العدد يتبع آخر سؤال أُجيب عنه
+        competition.answered_count = max(index for index, _ in answers) + 1
+    competition.correct_answers += sum(1 for _, answer in answers if answer['is_correct'])
+
+    changes = {'answered_count': competition.answered_count, 'correct_answers': competition.correct_answers}
+    completed = group['completed'] and not competition.is_completed
+    if completed:
+        competition.is_completed = True
+        competition.end_time = _datetime(group['completed']['at'])
+        competition.calculate_score()
+        changes.update(is_completed=True, end_time=competition.end_time, score=competition.score)
+    Competition.objects.filter(id=competition.id).update(**changes)
+    if completed:
+        record_competition_completed(competition)
+    return len(answers)
+
+
+def _requeue(journal, events):
+    """إعادة أحداث لم تُطبق إلى السجل؛ بعد MAX_REQUEUE محاولة تُحفظ في orphaned-*.jsonl"""
+    retry, orphaned = [], []
+    for event in events:
+        event['requeued'] = event.get('requeued', 0) + 1
+        (orphaned if event['requeued'] > MAX_REQUEUE else retry).append(event)
+    if retry:
+        journal.write_file('journal-requeued', retry)
+    if orphaned:
+        path = journal.write_file('orphaned', orphaned)
+        logger.error('أحداث بدون مسابقة معروفة بعد %s محاولات، حُفظت في %s', MAX_REQUEUE, path)
+
+
+def replay_journal(journal=None, batch_size=DEFAULT_REPLAY_BATCH, blocking=True):
+    """كتابة أحداث السجل في قاعدة البيانات على دفعات؛ تُعيد عدادات ما كُتب
+
+    تُعيد None إذا كانت عملية أخرى تعيد تشغيل السجل الآن (blocking=False).
+    """
+    from .models import Competition
+
+    journal = journal or get_journal()
+    replay_lock = journal.replay_lock(blocking)
+    if replay_lock is None:
+        return None
+
+    counters = {'files': 0, 'competitions': 0, 'answers': 0, 'orphans': 0}
+    claimed = []
+    try:
+        claimed = journal.claim()
+        events = [event for _, handle in claimed for event in read_events(handle)]
+        groups = list(group_events(events).items())
+        unapplied = []
+        for start in range(0, len(groups), batch_size):
+            batch = groups[start:start + batch_size]
+            with transaction.atomic():
+                existing = Competition.objects.in_bulk(
+                    [journal_id for journal_id, _ in batch], field_name='journal_id'
+                )
+                for journal_id, group in batch:
+                    added = _replay_group(journal_id, group, existing.get(journal_id))
+                    if added is None:
+                        counters['orphans'] += 1
+                        unapplied.extend(group['events'])
+                        continue
+                    counters['competitions'] += 1
+                    counters['answers'] += added
+        # لا يُحذف أي ملف قبل حفظ ما لم يُطبق منه في ملف جديد
+        if unapplied:
+            _requeue(journal, unapplied)
+        for path, _ in claimed:
+            os.remove(path)
+        counters['files'] = len(claimed)
+    finally:
+        for _, handle in claimed:
+            handle.close()
+        replay_lock.close()
+    return counters
+
+
+class JournalReplayer:
+    """خيط في الخلفية يعيد تشغيل السجل حتى تعود قاعدة البيانات ويفرغ السجل"""
+
+    def __init__(self, journal, interval=DEFAULT_REPLAY_INTERVAL):
+        self.journal = journal
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='answer-journal-replay', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while self.journal.pending():
+            time.sleep(self.interval)
+            try:
+                counters = replay_journal(self.journal, blocking=False)
+                if counters is not None:
+                    logger.info('أُعيد تشغيل سجل الكتابة المتأخرة: %s', counters)
+            except DatabaseError as e:
+                logger.warning('قاعدة البيانات ما زالت غير متاحة لإعادة تشغيل السجل: %s', e)
+            finally:
+                connections.close_all()
+
+
+_journal = None
+_replayer = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = Journal(settings.ANSWER_JOURNAL_DIR, getattr(settings, 'ANSWER_JOURNAL_FSYNC', False))
+    return _journal
+
+
+def get_replayer():
+    global _replayer
+    if _replayer is None:
+        with _journal_lock:
+            if _replayer is None:
+                _replayer = JournalReplayer(
+                    get_journal(), getattr(settings, 'ANSWER_JOURNAL_REPLAY_INTERVAL', DEFAULT_REPLAY_INTERVAL)
+                )
+    return _replayer
+
+
+def replay_on_boot():
+    """إعادة تشغيل أحداث عامل سابق عند أول طلب في عملية الخادم (من CompetitionsConfig.ready)"""
+    from .pool import _serving_process
+
+    if _serving_process() and get_journal().pending():
+        get_replayer().start()
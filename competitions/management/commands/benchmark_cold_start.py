@@ -0,0 +1,101 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# يُشغَّل في عملية جديدة لكل قياس: بدء التطبيق ثم أول طلب ثم الطلب الثاني
+PROBE_SCRIPT = '''
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+loaded = time.perf_counter()
+
+def request(path):
+    environ = {'PATH_INFO': path, 'HTTP_HOST': '127.0.0.1'}
+    setup_testing_defaults(environ)
+    status = []
+    begin = time.perf_counter()
+    body = application(environ, lambda s, h, exc_info=None: status.append(s))
+    b''.join(body)
+    if hasattr(body, 'close'):
+        body.close()
+    return (time.perf_counter() - begin) * 1000, status[0]
+
+first_ms, status = request(sys.argv[1])
+second_ms, _ = request(sys.argv[1])
+print(json.dumps({
+    'startup_ms': (loaded - started) * 1000,
+    'first_ms': first_ms,
+    'second_ms': second_ms,
+    'status': status,
+}))
+'''
+
+PROFILES = ['development', 'production', 'render']
+
+
+class Command(BaseCommand):
+    help = 'قياس زمن بدء تشغيل العامل وزمن أول طلب (cold start) في عمليات جديدة'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='عدد العمليات الجديدة المطلوب قياسها')
+        parser.add_argument('--path', default='/', help='المسار المطلوب في أول طلب')
+        parser.add_argument('--profile', action='append', dest='profiles', choices=PROFILES,
+                            help='ملف إعدادات alhassan.settings عبر DJANGO_ENV (يمكن تكراره). '
+                                 'الافتراضي: الإعدادات الحالية')
+        parser.add_argument('--budget-ms', type=float,
+                            help='يفشل الأمر إذا تجاوز وسيط زمن بدء التشغيل هذه القيمة')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        ))
+
+        over_budget = []
+        for profile in options['profiles'] or [None]:
+            if profile:
+                env.update(DJANGO_SETTINGS_MODULE='alhassan.settings', DJANGO_ENV=profile)
+            label = profile or env['DJANGO_SETTINGS_MODULE']
+            self.stdout.write(f'🚀 [{label}] قياس {options["runs"]} عملية جديدة على المسار {options["path"]}')
+
+            results = self.run_profile(env, options['runs'], options['path'])
+            self.stdout.write('\n⏱️ الوسيط (مللي ثانية):')
+            for key, name in [('startup_ms', 'بدء التشغيل'), ('first_ms', 'أول طلب'), ('second_ms', 'الطلب الثاني')]:
+                self.stdout.write(f'  {name:<14} {statistics.median(r[key] for r in results):>8.1f}')
+            self.stdout.write('')
+
+            startup_ms = statistics.median(r['startup_ms'] for r in results)
+            if options['budget_ms'] is not None and startup_ms > options['budget_ms']:
+                over_budget.append(f'{label}: {startup_ms:.1f} ms')
+
+        if over_budget:
+            raise CommandError(
+                f'زمن بدء التشغيل تجاوز الحد ({options["budget_ms"]:.0f} ms): ' + '، '.join(over_budget)
+            )
+        if options['budget_ms'] is not None:
+            self.stdout.write(self.style.SUCCESS(f'✅ زمن بدء التشغيل ضمن الحد ({options["budget_ms"]:.0f} ms)'))
+
+    def run_profile(self, env, runs, path):
+        results = []
+        for run in range(max(runs, 1)):
+            completed = subprocess.run(
+                [sys.executable, '-c', PROBE_SCRIPT, path],
+                env=env, cwd=settings.BASE_DIR, capture_output=True, text=True
+            )
+            if completed.returncode:
+                raise CommandError(f'فشل بدء التشغيل:\n{completed.stderr.strip()}')
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            self.stdout.write(
+                f'  #{run + 1}: بدء {result["startup_ms"]:.1f} ms، أول طلب {result["first_ms"]:.1f} ms، '
+                f'الطلب الثاني {result["second_ms"]:.1f} ms ({result["status"]})'
+            )
+        return results
@@ -0,0 +1,152 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from accounts.models import StudentSession
+from competitions.models import Answer, Competition
+from competitions.question_bank import GRADE_LEVELS, draw_competition_questions
+
+
+# الفهارس المضافة لمسارات الاستعلام الساخنة
+HOT_PATH_MODELS = [Competition, Answer, StudentSession]
+
+
+class _Rollback(Exception):
+    """تُستخدم للتراجع عن حذف الفهارس المؤقت بعد القياس"""
+
+
+class Command(BaseCommand):
+    help = 'قياس زمن وخطط تنفيذ استعلامات لوحة التحكم قبل الفهارس وبعدها'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='عدد الإجابات التجريبية المطلوب إنشاؤها قبل القياس (مثال: 1000000)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='عدد مرات تكرار كل استعلام (يُعرض أفضل زمن)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--no-plans', action='store_true',
+                            help='عرض الأزمنة فقط بدون خطط التنفيذ')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'], options['batch_size'])
+
+        self.stdout.write(f'📊 {Competition.objects.count()} مسابقة، {Answer.objects.count()} إجابة')
+
+        # "قبل": حذف الفهارس مؤقتاً داخل معاملة يتم التراجع عنها بعد القياس
+        before = {}
+        try:
+            with transaction.atomic():
+                self.drop_indexes()
+                before = self.run_queries(options['repeat'], not options['no_plans'], 'قبل الفهارس')
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        after = self.run_queries(options['repeat'], not options['no_plans'], 'بعد الفهارس')
+
+        self.stdout.write('\n⏱️ الملخص (أفضل زمن بالمللي ثانية):')
+        for name, after_ms in after.items():
+            before_ms = before.get(name, 0.0)
+            speedup = before_ms / after_ms if after_ms else 0
+            self.stdout.write(f'  {name:<28} {before_ms:>10.2f} → {after_ms:>10.2f}  (×{speedup:.1f})')
+
+    def queries(self):
+        """الاستعلامات الساخنة في لوحة التحكم والتقارير وصفحات المسابقة"""
+        competition_id = Competition.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        grade_level = GRADE_LEVELS[0]
+        completed = Competition.objects.filter(is_completed=True)
+        return {
+            'answers_per_competition': Answer.objects.filter(
+                competition_id=competition_id, is_correct=True
+            ).values('id'),
+            'recent_competitions': completed.order_by('-end_time').values('id')[:10],
+            'reports_by_grade': completed.filter(grade_level=grade_level).order_by('-end_time').values('id')[:50],
+            'grade_stats': completed.values('grade_level').annotate(
+                count=Count('id'), avg_score=Avg('score')
+            ).order_by('grade_level'),
+            'excellent_scores': completed.filter(score__gte=90).values('id'),
+            'active_sessions': StudentSession.objects.filter(is_active=True).values('id'),
+        }
+
+    def run_queries(self, repeat, show_plans, title):
+        self.stdout.write(f'\n🔍 {title}')
+        timings = {}
+        for name, queryset in self.queries().items():
+            if show_plans:
+                self.stdout.write(f'\n▶ {name}\n{queryset.explain()}')
+            best = None
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                len(list(queryset.all()))
+                elapsed = (time.perf_counter() - started) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            self.stdout.write(f'  {name}: {best:.2f} ms')
+        return timings
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for model in HOT_PATH_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+    def seed(self, answer_count, batch_size):
+        """إنشاء بيانات تجريبية: 10 إجابات لكل مسابقة"""
+        self.stdout.write(f'🌱 إنشاء {answer_count} إجابة تجريبية...')
+        questions = {
+            grade_level: draw_competition_questions(grade_level, 'medium', 10)
+            for grade_level in GRADE_LEVELS
+        }
+        now = timezone.now()
+        competitions_needed = max(answer_count // 10, 1)
+        created = 0
+
+        while created < competitions_needed:
+            size = min(batch_size, competitions_needed - created)
+            competitions = []
+            for _ in range(size):
+                correct = random.randint(0, 10)
+                grade_level = random.choice(GRADE_LEVELS)
+                competitions.append(Competition(
+                    student_name=f'طالب {created + len(competitions)}',
+                    grade_level=grade_level,
+                    total_questions=10,
+                    answered_count=10,
+                    correct_answers=correct,
+                    score=correct * 10.0,
+                    is_completed=random.random() < 0.9,
+                    end_time=now - timedelta(minutes=random.randint(0, 60 * 24 * 365)),
+                    questions=questions[grade_level],
+                ))
+
+            with transaction.atomic():
+                competitions = Competition.objects.bulk_create(competitions)
+                answers = []
+                for competition in competitions:
+                    for index, question in enumerate(competition.questions):
+                        is_correct = index < competition.correct_answers
+                        answers.append(Answer(
+                            competition_id=competition.id,
+                            question_id=question['id'],
+                            student_answer=question['answer'] if is_correct else -1,
+                            is_correct=is_correct,
+                        ))
+                Answer.objects.bulk_create(answers, batch_size=batch_size)
+                StudentSession.objects.bulk_create([
+                    StudentSession(
+                        student_name=competition.student_name,
+                        access_code='seed',
+                        grade_level=competition.grade_level,
+                        is_active=random.random() < 0.05,
+                    )
+                    for competition in competitions
+                ])
+
+            created += size
+            self.stdout.write(f'  {created * 10}/{competitions_needed * 10}')
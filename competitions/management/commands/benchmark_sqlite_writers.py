@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core import signals
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+
+from alhassan.db_config import sqlite_database
+
+
+PROFILES = ['default', 'production']
+
+
+def _use(database):
+    """توجيه الاتصال الافتراضي في هذه العملية إلى قاعدة بيانات الاختبار"""
+    connection = connections['default']
+    connection.close()
+    connection.settings_dict.update({
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        **database,
+    })
+
+
+def _writer(database, competition_id, answers, barrier, results):
+    """عامل يكتب answers إجابة، كل إجابة في دورة طلب كاملة مثل عرض submit_answer"""
+    from competitions.engine import database_storage, submit_answer
+
+    _use(database)
+    latencies = []
+    locked = 0
+    barrier.wait()
+    started = time.time()
+    for _ in range(answers):
+        begin = time.perf_counter()
+        # إشارات بداية ونهاية الطلب تطبق CONN_MAX_AGE كما في الخادم
+        signals.request_started.send(sender=None)
+        try:
+            competition = database_storage.get(competition_id)
+            question = database_storage.question(competition, competition.answered_count)
+            submit_answer(database_storage, competition, competition.answered_count + 1, question['answer'])
+        except OperationalError:
+            locked += 1
+        finally:
+            signals.request_finished.send(sender=None)
+        latencies.append((time.perf_counter() - begin) * 1000)
+    results.put({'started': started, 'finished': time.time(), 'latencies': latencies, 'locked': locked})
+
+
+class Command(BaseCommand):
+    help = 'اختبار حمل لعدة عمال يكتبون الإجابات في SQLite معاً (إعدادات Django الافتراضية مقابل ملف الإنتاج)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3, help='عدد العمليات الكاتبة (مثل عمال gunicorn)')
+        parser.add_argument('--answers', type=int, default=200, help='عدد الإجابات لكل عامل')
+        parser.add_argument('--profile', action='append', dest='profiles', choices=PROFILES,
+                            help='ملف الإعدادات (يمكن تكراره). الافتراضي: الاثنان')
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('هذا الاختبار يحتاج إلى fork (Linux أو macOS)')
+
+        directory = tempfile.mkdtemp(prefix='alhassan-sqlite-bench-')
+        try:
+            # قاعدة بيانات فارغة مرة واحدة، ونسخة جديدة منها لكل ملف إعدادات
+            template = os.path.join(directory, 'template.sqlite3')
+            _use(sqlite_database(template, 'default'))
+            call_command('migrate', 'auth', verbosity=0)
+            call_command('migrate', verbosity=0)
+            connections.close_all()
+
+            self.stdout.write(f'✍️ {options["workers"]} عمال × {options["answers"]} إجابة')
+            self.stdout.write(f'  {"الملف":<12} {"إجابة/ث":>10} {"p50 ms":>9} {"p95 ms":>9} {"database is locked":>20}')
+            for profile in options['profiles'] or PROFILES:
+                path = os.path.join(directory, f'{profile}.sqlite3')
+                shutil.copyfile(template, path)
+                result = self.run_profile(sqlite_database(path, profile), options['workers'], options['answers'])
+                self.stdout.write(
+                    f'  {profile:<12} {result["rate"]:>10.1f} {result["p50"]:>9.2f} '
+                    f'{result["p95"]:>9.2f} {result["locked"]:>20}'
+                )
+        finally:
+            connections.close_all()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def run_profile(self, database, workers, answers):
+        from competitions.models import Competition
+        from competitions.question_bank import draw_competition_questions
+
+        _use(database)
+        competition_ids = [
+            Competition.objects.create(
+                student_name=f'اختبار حمل {number}',
+                grade_level='الصف الأول',
+                difficulty='medium',
+                total_questions=answers,
+                questions=draw_competition_questions('الصف الأول', 'medium', answers),
+            ).id
+            for number in range(workers)
+        ]
+        # لا تُورث العمليات الفرعية اتصالاً مفتوحاً
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        barrier = context.Barrier(workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_writer, args=(database, competition_id, answers, barrier, results))
+            for competition_id in competition_ids
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        latencies = sorted(latency for result in collected for latency in result['latencies'])
+        locked = sum(result['locked'] for result in collected)
+        elapsed = max(result['finished'] for result in collected) - min(result['started'] for result in collected)
+        return {
+            'rate': (len(latencies) - locked) / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'locked': locked,
+        }
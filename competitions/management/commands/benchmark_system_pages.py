@@ -0,0 +1,87 @@
+import gzip
+import tracemalloc
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.shortcuts import render
+from django.test import RequestFactory
+from django.urls import get_resolver
+
+from alhassan.middleware import ErrorHandlingMiddleware
+
+
+STYLESHEET = 'css/system.css'
+
+
+def _gzip_size(content):
+    return len(gzip.compress(content, compresslevel=6))
+
+
+class Command(BaseCommand):
+    help = 'قياس الذاكرة المخصصة والبايتات المرسلة لكل استجابة في صفحات الأخطاء والإعداد والنظام الطارئ'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500, help='عدد الاستجابات لكل صفحة')
+
+    def pages(self):
+        """الصفحات المقاسة: دالة تبني استجابة لكل طلب
+
+        صفحات الإعداد تُعرض بسياق نموذجي بدلاً من استدعاء العرض، حتى لا يُشغَّل migrate.
+        معالجات 404 و500 تؤخذ من URLconf كما يفعل Django، فتُقاس الصفحات المرسلة فعلاً.
+        """
+        resolver = get_resolver()
+        handler404 = resolver.resolve_error_handler(404)
+        handler500 = resolver.resolve_error_handler(500)
+        middleware = ErrorHandlingMiddleware(lambda request: None)
+        error = RuntimeError('no such table: competitions_competition')
+        return {
+            '404': lambda request: handler404(request, None),
+            '500': handler500,
+            'ErrorHandlingMiddleware': lambda request: middleware.handle_error(request, error),
+            '/setup/ (نجاح)': lambda request: render(
+                request, 'system/setup_done.html', {'admin_created': True}
+            ),
+            '/setup/ (خطأ)': lambda request: render(
+                request, 'system/setup_failed.html', {'error': error, 'retry_url': '/setup/'}, status=500
+            ),
+            '/emergency/ (نجاح)': lambda request: render(
+                request, 'system/setup_done.html', {'admin_created': False}
+            ),
+            '/status/': lambda request: render(request, 'system/status.html', {
+                'status': {'database_ready': True, 'admin_exists': True, 'tables_count': 17},
+            }),
+        }
+
+    def measure(self, build, request, repeat):
+        """متوسط الذاكرة المخصصة (أعلى قيمة أثناء بناء الاستجابة) وحجم الاستجابة"""
+        response = build(request)
+        allocated = 0
+        tracemalloc.start()
+        try:
+            for _ in range(repeat):
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                response = build(request)
+                allocated += tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        return allocated / repeat, response.content
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        request = RequestFactory().get('/')
+
+        self.stdout.write(f'📦 {repeat} استجابة لكل صفحة (بايت لكل استجابة)')
+        self.stdout.write(f'  {"الصفحة":<26} {"ذاكرة مخصصة":>12} {"HTML":>8} {"gzip":>8}')
+        for name, build in self.pages().items():
+            allocated, content = self.measure(build, request, repeat)
+            self.stdout.write(f'  {name:<26} {allocated:>12.0f} {len(content):>8} {_gzip_size(content):>8}')
+
+        path = finders.find(STYLESHEET)
+        if path:
+            with open(path, 'rb') as f:
+                stylesheet = f.read()
+            self.stdout.write(
+                f'\n🎨 {STYLESHEET}: {len(stylesheet)} بايت ({_gzip_size(stylesheet)} gzip)، '
+                'يُحمّل مرة واحدة ويُخزن في المتصفح'
+            )
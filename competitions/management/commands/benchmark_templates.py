@@ -0,0 +1,91 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from competitions.question_bank import GRADE_LEVELS
+
+
+class _Competition:
+    """مسابقة للعرض فقط (بدون قاعدة بيانات)"""
+    id = 1
+    student_name = 'طالب تجريبي'
+    grade_level = GRADE_LEVELS[0]
+    total_questions = 10
+    correct_answers = 7
+    score = 70.0
+
+
+class Command(BaseCommand):
+    help = 'قياس زمن عرض قوالب صفحات المسابقة مع محمّل القوالب المخزن وبدونه'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000, help='عدد مرات عرض كل صفحة')
+
+    def pages(self):
+        """القوالب المقاسة وسياق عرض نموذجي لكل منها"""
+        from competitions.engine import score_band
+
+        competition = _Competition()
+        return {
+            'competitions/start.html': {
+                'student_name': competition.student_name,
+                'grade_level': competition.grade_level,
+                'difficulty_level': 'medium',
+                'competition': competition,
+            },
+            'competitions/question.html': {
+                'question': {'text': '12 + 7'},
+                'question_number': 3,
+                'total_questions': competition.total_questions,
+                'student_name': competition.student_name,
+            },
+            'competitions/results.html': {
+                'competition': competition,
+                'answers': [],
+                'percentage': competition.score,
+                'band': score_band(competition.score),
+                'wrong_answers': competition.total_questions - competition.correct_answers,
+            },
+            'competitions/batch.html': {
+                'student_name': competition.student_name,
+            },
+        }
+
+    def uncached_engine(self):
+        """نسخة من إعدادات القوالب بمحمّلات بدون تخزين (تُحلل القالب في كل مرة)"""
+        config = dict(settings.TEMPLATES[0])
+        options = dict(config.get('OPTIONS', {}))
+        options['loaders'] = [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]
+        config.pop('BACKEND', None)
+        config.update({'NAME': 'uncached', 'APP_DIRS': False, 'OPTIONS': options})
+        return DjangoTemplates(config)
+
+    def measure(self, engine, name, context, request, repeat):
+        template = None
+        started = time.perf_counter()
+        for _ in range(repeat):
+            template = engine.get_template(name)
+            template.render(context, request)
+        return (time.perf_counter() - started) * 1_000_000 / repeat
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        request = RequestFactory().get('/student/')
+        configured = engines['django']
+        uncached = self.uncached_engine()
+
+        self.stdout.write(f'🖼️ عرض كل صفحة {repeat} مرة (ميكروثانية لكل عرض)')
+        self.stdout.write(f'  {"القالب":<30} {"بدون تخزين":>12} {"الإعدادات":>12}')
+        for name, context in self.pages().items():
+            # عرض أولي لتعبئة الذاكرة المؤقتة (القوالب والأجزاء المخزنة)
+            configured.get_template(name).render(context, request)
+            before = self.measure(uncached, name, context, request, repeat)
+            after = self.measure(configured, name, context, request, repeat)
+            self.stdout.write(f'  {name:<30} {before:>12.1f} {after:>12.1f}')
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from competitions.models import Question
+from competitions.question_bank import (
+    DIFFICULTY_LEVELS,
+    GRADE_LEVELS,
+    build_question_bank,
+)
+
+
+class Command(BaseCommand):
+    help = 'تعبئة بنك الأسئلة مسبقاً لكل مستوى دراسي ومستوى صعوبة'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grade', action='append', dest='grades',
+                            help='المستوى الدراسي (يمكن تكراره). الافتراضي: جميع المستويات')
+        parser.add_argument('--difficulty', action='append', dest='difficulties',
+                            choices=DIFFICULTY_LEVELS,
+                            help='مستوى الصعوبة (يمكن تكراره). الافتراضي: جميع المستويات')
+        parser.add_argument('--size', type=int, default=200,
+                            help='عدد الأسئلة الفريدة المطلوبة لكل مجموعة')
+        parser.add_argument('--top-up', action='store_true',
+                            help='تعبئة المجموعات التي فيها أقل من --size سؤال فقط (للتشغيل في كل نشر)')
+
+    def handle(self, *args, **options):
+        grades = options['grades'] or GRADE_LEVELS
+        difficulties = options['difficulties'] or DIFFICULTY_LEVELS
+
+        self.stdout.write('🏦 بدء تعبئة بنك الأسئلة...')
+        total = 0
+        for grade_level in grades:
+            for difficulty_level in difficulties:
+                size = options['size']
+                if options['top_up']:
+                    size -= Question.objects.filter(grade_level=grade_level, difficulty=difficulty_level).count()
+                    if size <= 0:
+                        continue
+                created = build_question_bank(grade_level, difficulty_level, size)
+                total += created
+                self.stdout.write(f'  {grade_level} / {difficulty_level}: +{created}')
+
+        self.stdout.write(f'✅ تمت إضافة {total} سؤال جديد إلى البنك')
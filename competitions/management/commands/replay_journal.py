@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from competitions.journal import DEFAULT_REPLAY_BATCH, get_journal, replay_journal
+
+
+class Command(BaseCommand):
+    help = 'كتابة سجل الكتابة المتأخرة (مسابقات وضع التشغيل بدون قاعدة بيانات) في قاعدة البيانات'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_REPLAY_BATCH,
+                            help='عدد المسابقات في كل معاملة')
+
+    def handle(self, *args, **options):
+        journal = get_journal()
+        if not journal.pending():
+            self.stdout.write(f'✅ لا توجد أحداث معلقة في {journal.directory}')
+            return
+
+        self.stdout.write(f'📼 إعادة تشغيل السجل من {journal.directory} (بعد انتهاء أي إعادة تشغيل جارية)...')
+        try:
+            counters = replay_journal(journal, options['batch_size'])
+        except DatabaseError as e:
+            raise CommandError(f'قاعدة البيانات غير متاحة، يبقى السجل للمحاولة التالية: {e}')
+
+        self.stdout.write(
+            f"✅ {counters['files']} ملف، {counters['competitions']} مسابقة، {counters['answers']} إجابة"
+        )
+        if counters['orphans']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {counters['orphans']} مسابقة بدون حدث إنشاء، أُعيدت أحداثها إلى السجل للمحاولة التالية"
+            ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='operand_a',
+            field=models.IntegerField(blank=True, null=True, verbose_name='العدد الأول'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='operand_b',
+            field=models.IntegerField(blank=True, null=True, verbose_name='العدد الثاني'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['grade_level', 'difficulty', 'operation_type'], name='question_bank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='question',
+            constraint=models.UniqueConstraint(fields=('grade_level', 'difficulty', 'operation_type', 'operand_a', 'operand_b'), name='unique_bank_question'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0002_question_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='difficulty',
+            field=models.CharField(choices=[('easy', 'سهل'), ('medium', 'متوسط'), ('hard', 'صعب')], default='medium', max_length=10, verbose_name='مستوى الصعوبة'),
+        ),
+        migrations.AddField(
+            model_name='competition',
+            name='questions',
+            field=models.JSONField(blank=True, default=list, verbose_name='أسئلة المسابقة'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_answered_count(apps, schema_editor):
+    """حساب عدد الإجابات للمسابقات الموجودة مرة واحدة"""
+    Competition = apps.get_model('competitions', 'Competition')
+    Answer = apps.get_model('competitions', 'Answer')
+
+    answers = Answer.objects.filter(competition=OuterRef('pk')).order_by().values('competition')
+    Competition.objects.update(
+        answered_count=Coalesce(
+            Subquery(answers.annotate(total=Count('id')).values('total'), output_field=IntegerField()),
+            0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0003_competition_questions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='answered_count',
+            field=models.IntegerField(default=0, verbose_name='الأسئلة المجابة'),
+        ),
+        migrations.RunPython(backfill_answered_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0004_competition_answered_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['competition', 'is_correct'], name='answer_competition_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['end_time'], name='competition_completed_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['grade_level', 'end_time'], name='competition_grade_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['grade_level', 'score'], name='competition_grade_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='competition',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['score'], name='competition_score_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='seed',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='بذرة الأسئلة'),
+        ),
+    ]
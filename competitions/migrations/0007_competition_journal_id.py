@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competitions', '0006_competition_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='journal_id',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True, verbose_name='معرف السجل'),
+        ),
+    ]
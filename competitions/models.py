@@ -1,5 +1,5 @@
 from django.db import models
-import random
+from django.utils import timezone
 
 
 class Question(models.Model):
@@ -23,11 +23,23 @@ class Question(models.Model):
     question_text = models.TextField(verbose_name="نص السؤال")
     correct_answer = models.IntegerField(verbose_name="الإجابة الصحيحة")
     grade_level = models.CharField(max_length=50, verbose_name="المستوى الدراسي")
+    operand_a = models.IntegerField(null=True, blank=True, verbose_name="العدد الأول")
+    operand_b = models.IntegerField(null=True, blank=True, verbose_name="العدد الثاني")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاريخ الإنشاء")
     
     class Meta:
         verbose_name = "سؤال"
         verbose_name_plural = "الأسئلة"
+        constraints = [
+            # بنك الأسئلة: سؤال واحد فقط لكل عملية وأعداد في كل مستوى وصعوبة
+            models.UniqueConstraint(
+                fields=['grade_level', 'difficulty', 'operation_type', 'operand_a', 'operand_b'],
+                name='unique_bank_question',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['grade_level', 'difficulty', 'operation_type'], name='question_bank_idx'),
+        ]
     
     def __str__(self):
         return f"{self.question_text} = {self.correct_answer}"
@@ -37,20 +49,69 @@ class Competition(models.Model):
     """نموذج المسابقة"""
     student_name = models.CharField(max_length=100, verbose_name="اسم الطالب")
     grade_level = models.CharField(max_length=50, verbose_name="المستوى الدراسي")
+    difficulty = models.CharField(max_length=10, choices=Question.DIFFICULTY_CHOICES, default='medium', verbose_name="مستوى الصعوبة")
     start_time = models.DateTimeField(auto_now_add=True, verbose_name="وقت البداية")
     end_time = models.DateTimeField(null=True, blank=True, verbose_name="وقت الانتهاء")
     total_questions = models.IntegerField(default=10, verbose_name="عدد الأسئلة")
     correct_answers = models.IntegerField(default=0, verbose_name="الإجابات الصحيحة")
+    answered_count = models.IntegerField(default=0, verbose_name="الأسئلة المجابة")
     is_completed = models.BooleanField(default=False, verbose_name="مكتملة")
     score = models.FloatField(default=0.0, verbose_name="النتيجة")
+    # أسئلة المسابقة المسحوبة مرة واحدة عند البداية: [{'id', 'text', 'answer'}, ...]
+    questions = models.JSONField(default=list, blank=True, verbose_name="أسئلة المسابقة")
+    # بذرة مولد الأسئلة: تكفي لإعادة توليد نفس أسئلة المسابقة
+    seed = models.BigIntegerField(null=True, blank=True, verbose_name="بذرة الأسئلة")
+    # معرف المسابقة في سجل الكتابة المتأخرة إذا أُنشئت أثناء تعذر الوصول لقاعدة البيانات
+    journal_id = models.CharField(max_length=32, null=True, blank=True, unique=True, verbose_name="معرف السجل")
     
     class Meta:
         verbose_name = "مسابقة"
         verbose_name_plural = "المسابقات"
+        # فهارس جزئية على المسابقات المكتملة فقط: Django يكتب is_completed=True
+        # كشرط منطقي مباشر، فلا يستطيع SQLite البحث به داخل فهرس مركب عادي
+        indexes = [
+            # آخر المسابقات المكتملة (لوحة التحكم)
+            models.Index(fields=['end_time'], condition=models.Q(is_completed=True),
+                         name='competition_completed_end_idx'),
+            # تقارير الطلاب حسب المستوى مرتبة بوقت الانتهاء
+            models.Index(fields=['grade_level', 'end_time'], condition=models.Q(is_completed=True),
+                         name='competition_grade_end_idx'),
+            # إحصائيات المستويات (متوسط النتيجة لكل مستوى)
+            models.Index(fields=['grade_level', 'score'], condition=models.Q(is_completed=True),
+                         name='competition_grade_score_idx'),
+            # توزيع النتائج حسب نطاقات الدرجات
+            models.Index(fields=['score'], condition=models.Q(is_completed=True),
+                         name='competition_score_idx'),
+        ]
     
     def __str__(self):
         return f"مسابقة {self.student_name} - {self.grade_level}"
     
+    def record_answer(self, answered_count, is_correct):
+        """زيادة عدادات المسابقة ذرياً بتعبيرات F()
+
+        التحديث مشروط بعدد الإجابات الحالي، فيعيد False إذا سبق تسجيل
+        الإجابة على هذا السؤال (نقرة مزدوجة أو إعادة إرسال من عامل آخر).
+        """
+        updated = Competition.objects.filter(id=self.id, answered_count=answered_count).update(
+            answered_count=models.F('answered_count') + 1,
+            correct_answers=models.F('correct_answers') + int(is_correct)
+        )
+        return updated == 1
+    
+    def complete(self):
+        """إنهاء المسابقة وحساب النتيجة؛ تُعيد True فقط للطلب الذي أنهاها فعلاً"""
+        self.end_time = timezone.now()
+        self.calculate_score()
+        updated = Competition.objects.filter(id=self.id, is_completed=False).update(
+            is_completed=True,
+            end_time=self.end_time,
+            score=self.score
+        )
+        if updated:
+            self.is_completed = True
+        return updated == 1
+    
     def calculate_score(self):
         """حساب النتيجة"""
         if self.total_questions > 0:
@@ -69,6 +130,9 @@ class Answer(models.Model):
     class Meta:
         verbose_name = "إجابة"
         verbose_name_plural = "الإجابات"
+        indexes = [
+            models.Index(fields=['competition', 'is_correct'], name='answer_competition_correct_idx'),
+        ]
     
     def __str__(self):
         return f"إجابة {self.competition.student_name} - {self.question.question_text}"
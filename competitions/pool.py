@@ -0,0 +1,206 @@
+"""
+مخزن الأسئلة الجاهزة - منصة المسابقات الرياضية
+Process-local pool of bank questions that are already persisted and ready
+to issue, keyed by (grade_level, difficulty, operation_type). Starting a
+competition pops its questions from memory instead of generating and
+writing them. Buckets are kept in a bounded LRU. A background thread tops
+up buckets that run low by reading random rows from the bank; the pool
+never writes. The bank is seeded once per deploy with
+`manage.py build_question_bank --top-up`, not by every worker.
+
+The pool is prewarmed on the first request each serving process handles
+(CompetitionsConfig.ready() connects the request_started hook), so no
+query runs while the apps are still initializing.
+
+Competitions served from the pool have no seed: the stored question list
+is the source of truth. When the pool misses, the caller falls back to the
+seeded generator.
+"""
+
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.db import connections
+
+from .generator import OPERATION_TYPES
+from .question_bank import DIFFICULTY_LEVELS, GRADE_LEVELS, normalize_difficulty, sample_bank_questions
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 50
+DEFAULT_MAX_BUCKETS = 128
+
+
+class QuestionPool:
+    """أسئلة جاهزة في الذاكرة لكل (مستوى، صعوبة، عملية) مع إعادة تعبئة في الخلفية"""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_buckets=DEFAULT_MAX_BUCKETS):
+        self.size = size
+        self.max_buckets = max_buckets
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._worker = None
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'refills': 0,
+            'refilled_questions': 0,
+            'refill_errors': 0,
+            'evictions': 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def _bucket(self, key):
+        """الحاوية الخاصة بالمفتاح (تُستدعى مع القفل) وتحديث ترتيب LRU"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+                self.counters['evictions'] += 1
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def take_competition(self, grade_level, difficulty_level, count, rng=random):
+        """أسئلة مسابقة كاملة من الذاكرة، أو None إذا لم تكفِ الأسئلة الجاهزة"""
+        if not self.enabled:
+            return None
+        difficulty_level = normalize_difficulty(difficulty_level)
+        operations = rng.choices(OPERATION_TYPES, k=count)
+
+        taken = []
+        ids = set()
+        with self._lock:
+            for operation_type in operations:
+                key = (grade_level, difficulty_level, operation_type)
+                bucket = self._bucket(key)
+                question = None
+                while bucket:
+                    candidate = bucket.popleft()
+                    # سؤال مكرر داخل نفس المسابقة يُترك (يبقى في البنك)
+                    if candidate['id'] not in ids:
+                        question = candidate
+                        break
+                if len(bucket) < self.size // 2:
+                    self._schedule(key)
+                if question is None:
+                    # إعادة ما سُحب إلى مكانه والرجوع إلى المولد
+                    for bucket, question in reversed(taken):
+                        bucket.appendleft(question)
+                    self.counters['misses'] += 1
+                    return None
+                taken.append((bucket, question))
+                ids.add(question['id'])
+            self.counters['hits'] += 1
+        return [question for _, question in taken]
+
+    def prewarm(self, grade_levels=GRADE_LEVELS, difficulty_levels=DIFFICULTY_LEVELS):
+        """جدولة تعبئة جميع الحاويات في الخلفية"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for grade_level in grade_levels:
+                for difficulty_level in difficulty_levels:
+                    for operation_type in OPERATION_TYPES:
+                        key = (grade_level, difficulty_level, operation_type)
+                        self._bucket(key)
+                        self._schedule(key)
+
+    def refill(self, key):
+        """تعبئة حاوية واحدة حتى الحجم المحدد من أسئلة البنك (خارج القفل؛ قراءة فقط)"""
+        grade_level, difficulty_level, operation_type = key
+        with self._lock:
+            bucket = self._bucket(key)
+            needed = self.size - len(bucket)
+            ready = [question['id'] for question in bucket]
+        if needed <= 0:
+            return 0
+
+        questions = sample_bank_questions(grade_level, difficulty_level, operation_type, needed, exclude=ready)
+
+        with self._lock:
+            self._bucket(key).extend(questions)
+            self.counters['refills'] += 1
+            self.counters['refilled_questions'] += len(questions)
+        return len(questions)
+
+    def _schedule(self, key):
+        """إضافة المفتاح إلى طابور التعبئة (تُستدعى مع القفل)"""
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self._queue.put(key)
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='question-pool-refill', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            try:
+                self.refill(key)
+            except Exception as e:
+                self.counters['refill_errors'] += 1
+                logger.warning('تعذرت تعبئة مخزن الأسئلة %s: %s', key, e)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                # هذا الخيط لا يمر بدورة الطلبات، فتُغلق اتصالاته بعد كل تعبئة
+                connections.close_all()
+
+    def stats(self):
+        """عدادات المخزن الحالية"""
+        with self._lock:
+            counters = dict(self.counters)
+            counters['buckets'] = len(self._buckets)
+            counters['ready_questions'] = sum(len(bucket) for bucket in self._buckets.values())
+            counters['pending_refills'] = len(self._pending)
+        served = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / served, 3) if served else None
+        return counters
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = QuestionPool(
+                    size=getattr(settings, 'QUESTION_POOL_SIZE', DEFAULT_POOL_SIZE),
+                    max_buckets=getattr(settings, 'QUESTION_POOL_MAX_BUCKETS', DEFAULT_MAX_BUCKETS),
+                )
+    return _pool
+
+
+def _serving_process():
+    """هل هذه عملية خادم (gunicorn أو runserver) وليست أمر إدارة آخر؟"""
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    if program not in ('manage.py', 'django-admin', '__main__.py'):
+        return True
+    if sys.argv[1:2] != ['runserver']:
+        return False
+    # runserver يشغل عملية مراقبة وعملية خادم؛ التعبئة في عملية الخادم فقط
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+
+
+def prewarm_on_boot():
+    """تعبئة المخزن عند أول طلب في عملية الخادم (من CompetitionsConfig.ready)"""
+    if getattr(settings, 'QUESTION_POOL_PREWARM', True) and _serving_process():
+        get_pool().prewarm()
@@ -0,0 +1,92 @@
+"""
+تقدم الطالب في المسابقة - منصة المسابقات الرياضية
+The student flow only carries a few values between requests (name, grade,
+difficulty, competition id). get_progress() returns a dict-like store for
+them, chosen by the STUDENT_PROGRESS_BACKEND setting:
+
+    'session'        request.session (default)
+    'signed_cookie'  a compact cookie signed with django.core.signing, so the
+                     student pages need no session store at all and workers
+                     can be scaled without sharing session state
+
+StudentProgressMiddleware writes the cookie back when it was modified. The
+emergency views always use the signed cookie.
+"""
+
+from django.conf import settings
+from django.core import signing
+
+
+PROGRESS_COOKIE_NAME = 'student_progress'
+PROGRESS_SALT = 'competitions.progress'
+
+
+class SignedCookieProgress(dict):
+    """قيم التقدم المقروءة من كوكي موقّع، مع تتبع التعديل مثل الجلسة"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.modified = False
+        self.max_age = settings.STUDENT_SESSION_AGE
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.modified = True
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.modified = True
+
+    def pop(self, key, *args):
+        self.modified = self.modified or key in self
+        return super().pop(key, *args)
+
+    def set_expiry(self, value):
+        self.max_age = value
+        self.modified = True
+
+
+def uses_signed_cookie():
+    return getattr(settings, 'STUDENT_PROGRESS_BACKEND', 'session') == 'signed_cookie'
+
+
+def get_progress(request, backend=None):
+    """مخزن تقدم الطالب لهذا الطلب (الجلسة أو الكوكي الموقّع)
+
+    backend='signed_cookie' يفرض الكوكي الموقّع أياً كان الإعداد، ويستخدمه
+    النظام الطارئ حتى لا يحتاج إلى مخزن الجلسات في قاعدة البيانات.
+    """
+    if backend != 'signed_cookie' and not uses_signed_cookie():
+        return request.session
+
+    if not hasattr(request, '_student_progress'):
+        data = {}
+        value = request.COOKIES.get(PROGRESS_COOKIE_NAME)
+        if value:
+            try:
+                data = signing.loads(value, salt=PROGRESS_SALT, max_age=settings.STUDENT_SESSION_AGE)
+            except signing.BadSignature:
+                data = {}
+        request._student_progress = SignedCookieProgress(data)
+    return request._student_progress
+
+
+def save_progress(request, response):
+    """كتابة الكوكي الموقّع في الاستجابة إذا تغيرت قيم التقدم"""
+    progress = getattr(request, '_student_progress', None)
+    if progress is None or not progress.modified:
+        return response
+
+    if not progress:
+        response.delete_cookie(PROGRESS_COOKIE_NAME, samesite='Lax')
+        return response
+
+    response.set_cookie(
+        PROGRESS_COOKIE_NAME,
+        signing.dumps(dict(progress), salt=PROGRESS_SALT, compress=True),
+        max_age=progress.max_age,
+        secure=request.is_secure(),
+        httponly=True,
+        samesite='Lax',
+    )
+    return response
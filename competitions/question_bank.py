@@ -0,0 +1,136 @@
+"""
+بنك الأسئلة - منصة المسابقات الرياضية
+Question bank: one canonical, deduplicated row per (operation, operands)
+for every (grade_level, difficulty) pair.
+"""
+
+from django.db.models import Q
+
+from .generator import generate_question, generate_questions, new_seed
+from .models import Question
+
+
+# المستويات الدراسية المتاحة في نماذج الدخول
+GRADE_LEVELS = [
+    'الصف الأول',
+    'الصف الثاني',
+    'الصف الثالث',
+    'الصف الرابع',
+    'الصف الخامس',
+    'الصف السادس',
+]
+
+DIFFICULTY_LEVELS = [choice for choice, _ in Question.DIFFICULTY_CHOICES]
+
+
+def normalize_difficulty(difficulty_level):
+    """إرجاع مستوى صعوبة صالح (متوسط افتراضياً)"""
+    if difficulty_level in DIFFICULTY_LEVELS:
+        return difficulty_level
+    return 'medium'
+
+
+def generate_random_question(grade_level, difficulty_level='medium'):
+    """إنشاء سؤال رياضي عشوائي حسب مستوى الصعوبة"""
+    return generate_question(normalize_difficulty(difficulty_level))
+
+
+def _bank_lookup(grade_level, difficulty_level, generated):
+    """مفتاح السؤال الفريد داخل البنك"""
+    a, b = generated['operands']
+    return {
+        'grade_level': grade_level,
+        'difficulty': difficulty_level,
+        'operation_type': generated['operation_type'],
+        'operand_a': a,
+        'operand_b': b,
+    }
+
+
+def build_question_bank(grade_level, difficulty_level='medium', size=200):
+    """تعبئة البنك مسبقاً بعدد من الأسئلة الفريدة، وإرجاع عدد الأسئلة الجديدة"""
+    difficulty_level = normalize_difficulty(difficulty_level)
+
+    # إزالة التكرار على (العملية، الأعداد) قبل الكتابة
+    unique = {}
+    attempts = 0
+    while len(unique) < size and attempts < size * 10:
+        attempts += 1
+        generated = generate_random_question(grade_level, difficulty_level)
+        key = (generated['operation_type'], *generated['operands'])
+        unique.setdefault(key, generated)
+
+    bank = Question.objects.filter(grade_level=grade_level, difficulty=difficulty_level)
+    before = bank.count()
+    Question.objects.bulk_create(
+        [
+            Question(
+                question_text=generated['text'],
+                correct_answer=generated['answer'],
+                **_bank_lookup(grade_level, difficulty_level, generated)
+            )
+            for generated in unique.values()
+        ],
+        ignore_conflicts=True,
+    )
+    return bank.count() - before
+
+
+def sample_bank_questions(grade_level, difficulty_level, operation_type, count, exclude=()):
+    """أسئلة عشوائية موجودة في البنك لعملية واحدة (قراءة فقط)"""
+    rows = (
+        Question.objects
+        .filter(grade_level=grade_level, difficulty=difficulty_level, operation_type=operation_type)
+        .exclude(id__in=list(exclude))
+        .order_by('?')
+        .values_list('id', 'question_text', 'correct_answer')[:count]
+    )
+    return [{'id': pk, 'text': text, 'answer': answer} for pk, text, answer in rows]
+
+
+def draw_competition_questions(grade_level, difficulty_level='medium', count=10, seed=None):
+    """سحب مجموعة أسئلة المسابقة كاملة من البنك دفعة واحدة
+
+    تُعاد قائمة مختصرة [{'id', 'text', 'answer'}, ...] لتُحفظ مرة واحدة مع
+    المسابقة، فلا يحتاج إرسال الإجابة إلى أي بيانات من النموذج سوى الإجابة نفسها.
+    نفس البذرة seed تعيد نفس الأسئلة دائماً.
+    """
+    difficulty_level = normalize_difficulty(difficulty_level)
+    drawn = generate_questions(new_seed() if seed is None else seed, difficulty_level, count)
+    return persist_bank_questions(grade_level, difficulty_level, drawn)
+
+
+def persist_bank_questions(grade_level, difficulty_level, generated_questions):
+    """إدراج الأسئلة الناقصة في البنك ثم قراءتها جميعاً باستعلام واحد
+
+    تُعاد [{'id', 'text', 'answer'}, ...] بنفس ترتيب generated_questions.
+    """
+    Question.objects.bulk_create(
+        [
+            Question(
+                question_text=generated['text'],
+                correct_answer=generated['answer'],
+                **_bank_lookup(grade_level, difficulty_level, generated)
+            )
+            for generated in generated_questions
+        ],
+        ignore_conflicts=True,
+    )
+    conditions = Q()
+    for generated in generated_questions:
+        conditions |= Q(**_bank_lookup(grade_level, difficulty_level, generated))
+    ids = {
+        (operation_type, a, b): pk
+        for pk, operation_type, a, b in Question.objects.filter(conditions).values_list(
+            'id', 'operation_type', 'operand_a', 'operand_b'
+        )
+    }
+
+    return [
+        {
+            'id': ids[(generated['operation_type'], *generated['operands'])],
+            'text': generated['text'],
+            'answer': generated['answer'],
+        }
+        for generated in generated_questions
+    ]
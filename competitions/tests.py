@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import Answer, Competition
+from .progress import PROGRESS_COOKIE_NAME, PROGRESS_SALT, uses_signed_cookie
+from .question_bank import GRADE_LEVELS, draw_competition_questions
+
+
+# الحد الأقصى لعدد الاستعلامات لكل صفحة، مستقل عن عدد الإجابات المعروضة
+QUERY_BUDGETS = {
+    'competition_results': 4,
+    'admin_answer_list': 8,
+    'admin_competition_change': 8,
+}
+
+
+class QueryBudgetTests(TestCase):
+    """صفحات النتائج والإدارة لا تتجاوز عدد الاستعلامات المحدد (N+1)"""
+
+    answer_count = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        grade_level = GRADE_LEVELS[0]
+        questions = draw_competition_questions(grade_level, 'medium', cls.answer_count)
+        cls.competition = Competition.objects.create(
+            student_name='فحص الاستعلامات',
+            grade_level=grade_level,
+            total_questions=len(questions),
+            answered_count=len(questions),
+            questions=questions,
+        )
+        Answer.objects.bulk_create([
+            Answer(competition=cls.competition, question_id=question['id'],
+                   student_answer=question['answer'], is_correct=True)
+            for question in questions
+        ])
+        cls.competition.correct_answers = len(questions)
+        cls.competition.complete()
+        cls.admin_user = User.objects.create_superuser('query-budget-check', password=None)
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+        if uses_signed_cookie():
+            self.client.cookies[PROGRESS_COOKIE_NAME] = signing.dumps(
+                {'competition_id': self.competition.id}, salt=PROGRESS_SALT, compress=True
+            )
+        else:
+            session = self.client.session
+            session['competition_id'] = self.competition.id
+            session.save()
+
+    def assertWithinBudget(self, name, url):
+        """مثل assertNumQueries لكن العدد حد أقصى وليس قيمة مطابقة"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(context.captured_queries), QUERY_BUDGETS[name],
+            '\n'.join(query['sql'] for query in context.captured_queries)
+        )
+        return response
+
+    def test_competition_results(self):
+        response = self.assertWithinBudget('competition_results', '/student/results/')
+        self.assertContains(response, str(self.answer_count))
+
+    def test_admin_answer_list(self):
+        self.assertWithinBudget('admin_answer_list', '/admin/competitions/answer/')
+
+    def test_admin_competition_change(self):
+        self.assertWithinBudget(
+            'admin_competition_change', f'/admin/competitions/competition/{self.competition.id}/change/'
+        )
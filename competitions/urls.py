@@ -5,5 +5,7 @@ urlpatterns = [
     path('start/', views.competition_start, name='competition_start'),
     path('question/', views.get_question, name='get_question'),
     path('submit/', views.submit_answer, name='submit_answer'),
+    path('batch/', views.competition_batch, name='competition_batch'),
+    path('submit/batch/', views.submit_batch, name='submit_batch'),
     path('results/', views.competition_results, name='competition_results'),
 ]
@@ -1,86 +1,126 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.contrib import messages
-from django.utils import timezone
-from .models import Question, Competition, Answer
-import random
+from django.shortcuts import render, redirect
+from django.http import Http404, JsonResponse
+from django.db import DatabaseError
+from django.urls import reverse
+from . import engine
+from .engine import AnswerRejected, database_storage
+from .progress import get_progress
+import copy
+import json
 
 
 def competition_start(request):
     """بداية المسابقة"""
+    progress = get_progress(request)
     # التحقق من وجود جلسة طالب
-    if 'student_name' not in request.session:
+    if 'student_name' not in progress:
         return redirect('student_login')
 
-    student_name = request.session.get('student_name')
-    grade_level = request.session.get('grade_level')
-    difficulty_level = request.session.get('difficulty_level', 'medium')
+    student_name = progress.get('student_name')
+    grade_level = progress.get('grade_level')
+    difficulty_level = progress.get('difficulty_level', 'medium')
+
+    batch_mode = request.GET.get('format') == 'json'
 
     try:
-        # إنشاء مسابقة جديدة
-        competition = Competition.objects.create(
-            student_name=student_name,
-            grade_level=grade_level,
-            total_questions=10
+        competition = None
+        if batch_mode:
+            # وضع الدفعة الواحدة: إعادة استخدام المسابقة الحالية إذا لم تبدأ بعد
+            competition_id = progress.get('competition_id')
+            competition = engine.storage_for(competition_id).get(competition_id)
+            if competition is not None and (competition.is_completed or competition.answered_count):
+                competition = None
+
+        if competition is None:
+            competition = engine.start_competition(
+                database_storage, student_name, grade_level, difficulty_level
+            )
+    except DatabaseError:
+        # قاعدة البيانات غير متاحة أو مقفلة: المسابقة تستمر بدونها وتُكتب في
+        # سجل الكتابة المتأخرة ليُعاد تشغيله في قاعدة البيانات عند عودتها
+        competition = engine.start_competition(
+            engine.get_journaled_storage(), student_name, grade_level, difficulty_level
         )
 
-        # حفظ معرف المسابقة في الجلسة
-        request.session['competition_id'] = competition.id
+    # حفظ معرف المسابقة في الجلسة
+    progress['competition_id'] = competition.id
 
-        return render(request, 'competitions/start.html', {
+    if batch_mode:
+        # جميع الأسئلة في استجابة واحدة (بدون الإجابات الصحيحة)
+        return JsonResponse({
+            'competition_id': competition.id,
             'student_name': student_name,
-            'grade_level': grade_level,
-            'difficulty_level': difficulty_level,
-            'competition': competition
+            'total_questions': competition.total_questions,
+            'questions': [
+                {'number': number, 'text': question['text']}
+                for number, question in enumerate(competition.questions, start=1)
+            ],
+            'submit_url': reverse('submit_batch'),
+            'results_url': reverse('competition_results'),
         })
 
-    except Exception as e:
-        # في حالة عدم وجود جداول قاعدة البيانات
-        # إنشاء مسابقة وهمية
-        fake_competition = type('Competition', (), {
-            'id': 1,
-            'total_questions': 10,
-            'student_name': student_name,
-            'grade_level': grade_level
-        })()
+    return render(request, 'competitions/start.html', {
+        'student_name': student_name,
+        'grade_level': grade_level,
+        'difficulty_level': difficulty_level,
+        'competition': competition
+    })
 
-        request.session['competition_id'] = 1
 
-        return render(request, 'competitions/start.html', {
-            'student_name': student_name,
-            'grade_level': grade_level,
-            'difficulty_level': difficulty_level,
-            'competition': fake_competition
-        })
+def _current_competition(progress):
+    """(التخزين، المسابقة) لمسابقة الطالب الحالية: قاعدة البيانات أو السجل"""
+    storage = engine.storage_for(progress['competition_id'])
+    competition = storage.get(progress['competition_id'])
+    if competition is None:
+        raise Http404('المسابقة غير موجودة')
+    return storage, competition
+
+
+def _run(progress, operation):
+    """تشغيل operation(storage, competition) على مسابقة الطالب الحالية
+
+    إذا تعذرت الكتابة في قاعدة البيانات أثناء المسابقة (مثل database is locked)
+    تنتقل المسابقة إلى سجل الكتابة المتأخرة وتُعاد العملية فيه، فلا تضيع إجابة الطالب.
+    """
+    storage, competition = _current_competition(progress)
+    snapshot = copy.copy(competition)
+    try:
+        return operation(storage, competition)
+    except DatabaseError:
+        if storage is not database_storage:
+            raise
+    storage = engine.get_journaled_storage()
+    competition = storage.take_over(snapshot)
+    progress['competition_id'] = competition.id
+    return operation(storage, competition)
 
 
 def get_question(request):
     """الحصول على سؤال جديد"""
-    if 'competition_id' not in request.session:
+    progress = get_progress(request)
+    if 'competition_id' not in progress:
         return redirect('student_login')
     
-    competition = get_object_or_404(Competition, id=request.session['competition_id'])
-    
-    # التحقق من عدد الأسئلة المجابة
-    answered_count = Answer.objects.filter(competition=competition).count()
-    
-    if answered_count >= competition.total_questions:
-        # انتهاء المسابقة
-        competition.is_completed = True
-        competition.end_time = timezone.now()
-        competition.calculate_score()
-        competition.save()
+    def next_question(storage, competition):
+        # السؤال التالي من أسئلة المسابقة المحفوظة على الخادم
+        current = engine.current_question(storage, competition)
+        if current is None:
+            # انتهاء المسابقة وتحديث إحصائيات لوحة التحكم مرة واحدة فقط
+            engine.finish(storage, competition)
+        return competition, current
+
+    competition, current = _run(progress, next_question)
+    if current is None:
         return redirect('competition_results')
     
-    # إنشاء سؤال رياضي عشوائي
-    difficulty_level = request.session.get('difficulty_level', 'medium')
-    question = generate_random_question(competition.grade_level, difficulty_level)
-    
+    question_number, question = current
     context = {
         'question': question,
-        'question_number': answered_count + 1,
+        'question_number': question_number,
         'total_questions': competition.total_questions,
-        'student_name': competition.student_name
+        'student_name': competition.student_name,
+        'submit_url': reverse('submit_answer'),
+        'next_url': reverse('get_question'),
     }
     
     return render(request, 'competitions/question.html', context)
@@ -88,110 +128,66 @@ def get_question(request):
 
 def submit_answer(request):
     """إرسال الإجابة"""
-    if request.method == 'POST' and 'competition_id' in request.session:
-        competition = get_object_or_404(Competition, id=request.session['competition_id'])
+    progress = get_progress(request)
+    if request.method == 'POST' and 'competition_id' in progress:
+        try:
+            student_answer = int(request.POST.get('student_answer', 0))
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'الإجابة يجب أن تكون رقماً صحيحاً'}, status=400)
         
-        question_text = request.POST.get('question_text')
-        correct_answer = int(request.POST.get('correct_answer'))
-        student_answer = int(request.POST.get('student_answer', 0))
-        
-        # إنشاء سؤال مؤقت (في التطبيق الحقيقي، يجب حفظ الأسئلة في قاعدة البيانات)
-        question = Question(
-            question_text=question_text,
-            correct_answer=correct_answer,
-            operation_type='mixed',
-            difficulty='medium',
-            grade_level=competition.grade_level
-        )
-        question.save()
+        try:
+            result = _run(progress, lambda storage, competition: engine.submit_answer(
+                storage, competition, request.POST.get('question_number'), student_answer
+            ))
+        except AnswerRejected as e:
+            return JsonResponse({'error': str(e)})
         
-        # حفظ الإجابة
-        is_correct = student_answer == correct_answer
-        Answer.objects.create(
-            competition=competition,
-            question=question,
-            student_answer=student_answer,
-            is_correct=is_correct
-        )
-        
-        # تحديث عدد الإجابات الصحيحة
-        if is_correct:
-            competition.correct_answers += 1
-            competition.save()
-        
-        return JsonResponse({
-            'correct': is_correct,
-            'correct_answer': correct_answer
-        })
+        return JsonResponse(result)
     
     return JsonResponse({'error': 'خطأ في الإرسال'})
 
 
+def competition_batch(request):
+    """صفحة وضع الدفعة الواحدة: جميع الأسئلة في صفحة واحدة وإرسال واحد"""
+    progress = get_progress(request)
+    if 'student_name' not in progress:
+        return redirect('student_login')
+
+    return render(request, 'competitions/batch.html', {
+        'student_name': progress.get('student_name'),
+    })
+
+
+def submit_batch(request):
+    """تصحيح جميع إجابات المسابقة في طلب واحد وكتابة واحدة مجمعة"""
+    progress = get_progress(request)
+    if request.method == 'POST' and 'competition_id' in progress:
+        try:
+            answers = json.loads(request.body)['answers']
+            if not isinstance(answers, list):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'صيغة الإجابات غير صحيحة'}, status=400)
+
+        try:
+            result = _run(progress, lambda storage, competition: engine.submit_all(storage, competition, answers))
+        except AnswerRejected as e:
+            return JsonResponse({'error': str(e)}, status=409)
+
+        result['results_url'] = reverse('competition_results')
+        return JsonResponse(result)
+
+    return JsonResponse({'error': 'خطأ في الإرسال'})
+
+
 def competition_results(request):
     """نتائج المسابقة"""
-    if 'competition_id' not in request.session:
+    progress = get_progress(request)
+    if 'competition_id' not in progress:
         return redirect('student_login')
     
-    competition = get_object_or_404(Competition, id=request.session['competition_id'])
-    answers = Answer.objects.filter(competition=competition)
-    
-    context = {
-        'competition': competition,
-        'answers': answers,
-        'percentage': competition.score
-    }
+    storage, competition = _current_competition(progress)
+    context = engine.results_context(competition)
+    context['restart_url'] = reverse('competition_start')
     
     return render(request, 'competitions/results.html', context)
-
-
-def generate_random_question(grade_level, difficulty_level='medium'):
-    """إنشاء سؤال رياضي عشوائي حسب مستوى الصعوبة"""
-    operations = ['+', '-', '*', '/']
-    operation = random.choice(operations)
-
-    # تحديد نطاق الأرقام حسب مستوى الصعوبة
-    if difficulty_level == 'easy':
-        # سهل: أرقام صغيرة
-        add_range = (1, 20)
-        sub_range = (5, 30)
-        mul_range = (1, 5)
-        div_range = (2, 5)
-    elif difficulty_level == 'hard':
-        # صعب: أرقام كبيرة
-        add_range = (50, 200)
-        sub_range = (100, 500)
-        mul_range = (10, 25)
-        div_range = (5, 20)
-    else:
-        # متوسط: أرقام متوسطة
-        add_range = (10, 100)
-        sub_range = (20, 150)
-        mul_range = (2, 15)
-        div_range = (2, 12)
-
-    if operation == '+':
-        a = random.randint(*add_range)
-        b = random.randint(*add_range)
-        question = f"{a} + {b}"
-        answer = a + b
-    elif operation == '-':
-        a = random.randint(*sub_range)
-        b = random.randint(1, a)
-        question = f"{a} - {b}"
-        answer = a - b
-    elif operation == '*':
-        a = random.randint(*mul_range)
-        b = random.randint(*mul_range)
-        question = f"{a} × {b}"
-        answer = a * b
-    else:  # division
-        b = random.randint(*div_range)
-        answer = random.randint(1, div_range[1])
-        a = b * answer
-        question = f"{a} ÷ {b}"
-
-    return {
-        'text': question,
-        'answer': answer,
-        'difficulty': difficulty_level
-    }
@@ -0,0 +1,107 @@
+"""
+تحليلات المسابقات - منصة المسابقات الرياضية
+Single-pass analytics: every histogram and breakdown is one conditional
+aggregation query (Count with filter=Q(...)) instead of one scan per bucket.
+"""
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+
+# نطاقات توزيع النتائج: (المفتاح، الاسم، الحد الأدنى، الحد الأعلى غير المشمول)
+DEFAULT_SCORE_BUCKETS = [
+    ('excellent', 'ممتاز', 90, None),
+    ('good', 'جيد', 70, 90),
+    ('average', 'متوسط', 50, 70),
+    ('poor', 'ضعيف', None, 50),
+]
+
+
+def get_score_buckets(edges=None):
+    """نطاقات النتائج من الإعدادات، أو من حدود مخصصة مثل "50,70,90"
+
+    الحدود المخصصة تُنشئ نطاقات متتالية من الأعلى إلى الأدنى.
+    """
+    if not edges:
+        return getattr(settings, 'DASHBOARD_SCORE_BUCKETS', DEFAULT_SCORE_BUCKETS)
+
+    try:
+        values = sorted({float(edge) for edge in edges.split(',') if edge.strip()}, reverse=True)
+    except ValueError:
+        return get_score_buckets()
+    if not values:
+        return get_score_buckets()
+
+    bounds = [None] + values + [None]
+    buckets = []
+    for index in range(len(bounds) - 1):
+        high, low = bounds[index], bounds[index + 1]
+        if low is None:
+            label = f'< {high:g}'
+        elif high is None:
+            label = f'≥ {low:g}'
+        else:
+            label = f'{low:g} - {high:g}'
+        buckets.append((f'bucket_{index}', label, low, high))
+    return buckets
+
+
+def _bucket_filter(low, high):
+    condition = Q()
+    if low is not None:
+        condition &= Q(score__gte=low)
+    if high is not None:
+        condition &= Q(score__lt=high)
+    return condition
+
+
+def _bucket_counts(buckets):
+    return {key: Count('id', filter=_bucket_filter(low, high)) for key, _, low, high in buckets}
+
+
+def score_histogram(competitions, buckets):
+    """توزيع النتائج كاملاً باستعلام واحد"""
+    counts = competitions.aggregate(total=Count('id'), **_bucket_counts(buckets))
+    return {
+        'total': counts['total'],
+        'buckets': [
+            {'key': key, 'label': label, 'count': counts[key]}
+            for key, label, _, _ in buckets
+        ],
+    }
+
+
+def score_histogram_by(competitions, field, buckets, labels=None):
+    """توزيع النتائج لكل قيمة من field (المستوى أو الصعوبة) باستعلام واحد"""
+    labels = labels or {}
+    rows = competitions.values(field).annotate(
+        total=Count('id'), **_bucket_counts(buckets)
+    ).order_by(field)
+    return [
+        {
+            'value': labels.get(row[field], row[field]),
+            'total': row['total'],
+            'counts': [row[key] for key, _, _, _ in buckets],
+        }
+        for row in rows
+    ]
+
+
+def operation_accuracy(answers):
+    """دقة الإجابات لكل نوع عملية باستعلام واحد"""
+    from competitions.models import Question
+
+    names = dict(Question.OPERATION_CHOICES)
+    rows = answers.values('question__operation_type').annotate(
+        total=Count('id'),
+        correct=Count('id', filter=Q(is_correct=True))
+    ).order_by('question__operation_type')
+    return {
+        row['question__operation_type']: {
+            'name': names.get(row['question__operation_type'], row['question__operation_type']),
+            'total': row['total'],
+            'correct': row['correct'],
+            'accuracy': round(row['correct'] * 100 / row['total'], 1) if row['total'] else 0,
+        }
+        for row in rows
+    }
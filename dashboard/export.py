@@ -0,0 +1,122 @@
+"""
+تصدير النتائج - منصة المسابقات الرياضية
+Streaming CSV export of competition results. Rows are read as joined value
+tuples with .iterator(chunk_size=...) and written one at a time, so memory
+stays flat however many years of results are exported.
+
+XLSX is not streamed: an .xlsx file is a zip archive that openpyxl assembles
+in full before the first byte can be sent, so it is capped at XLSX_MAX_ROWS
+and larger exports have to use CSV.
+"""
+
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# الحد الأعلى لصفوف XLSX (الملف يُبنى كاملاً قبل الإرسال)؛ ما يزيد عنه يُصدّر CSV
+XLSX_MAX_ROWS = 10000
+
+COMPETITION_HEADERS = [
+    'رقم المسابقة', 'اسم الطالب', 'المستوى الدراسي', 'مستوى الصعوبة',
+    'وقت البداية', 'وقت الانتهاء', 'الإجابات الصحيحة', 'عدد الأسئلة', 'النتيجة',
+]
+
+ANSWER_HEADERS = [
+    'رقم المسابقة', 'اسم الطالب', 'المستوى الدراسي', 'السؤال', 'نوع العملية',
+    'الإجابة الصحيحة', 'إجابة الطالب', 'صحيحة', 'وقت الإجابة',
+]
+
+
+class Echo:
+    """كائن يشبه الملف يعيد ما يُكتب إليه بدلاً من تخزينه"""
+
+    def write(self, value):
+        return value
+
+
+def _format_time(value):
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def competition_rows(competitions):
+    """صف لكل مسابقة مكتملة"""
+    fields = (
+        'id', 'student_name', 'grade_level', 'difficulty', 'start_time',
+        'end_time', 'correct_answers', 'total_questions', 'score',
+    )
+    for row in competitions.order_by('-end_time', '-id').values_list(*fields).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        competition_id, name, grade, difficulty, start, end, correct, total, score = row
+        yield [
+            competition_id, name, grade, difficulty, _format_time(start),
+            _format_time(end), correct, total, round(score, 1),
+        ]
+
+
+def answer_rows(answers):
+    """صف لكل إجابة مع بيانات المسابقة والسؤال في نفس الاستعلام (JOIN)"""
+    from competitions.models import Question
+
+    operation_names = dict(Question.OPERATION_CHOICES)
+    fields = (
+        'competition_id', 'competition__student_name', 'competition__grade_level',
+        'question__question_text', 'question__operation_type', 'question__correct_answer',
+        'student_answer', 'is_correct', 'answer_time',
+    )
+    for row in answers.order_by('competition_id', 'id').values_list(*fields).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        competition_id, name, grade, text, operation, correct_answer, student_answer, is_correct, answered = row
+        yield [
+            competition_id, name, grade, text, operation_names.get(operation, operation),
+            correct_answer, student_answer, 'نعم' if is_correct else 'لا', _format_time(answered),
+        ]
+
+
+def stream_csv(headers, rows, filename):
+    """استجابة CSV متدفقة (مع BOM ليفتحها Excel بالعربية بشكل صحيح)"""
+    writer = csv.writer(Echo())
+
+    def content():
+        yield '﻿' + writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(content(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_available():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_xlsx(headers, rows, filename):
+    """ملف XLSX يُبنى كاملاً في ملف مؤقت ثم يُرسل (يتطلب openpyxl، وحتى XLSX_MAX_ROWS صف)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title='النتائج')
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.stats import rebuild_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'إعادة بناء إحصائيات لوحة التحكم المجمعة من جداول المسابقات'
+
+    def handle(self, *args, **options):
+        self.stdout.write('📊 إعادة بناء إحصائيات لوحة التحكم...')
+        stats = rebuild_dashboard_stats()
+        self.stdout.write(
+            f'✅ {stats.total_competitions} مسابقة، {stats.completed_competitions} مكتملة، '
+            f'{stats.active_sessions} جلسة نشطة'
+        )
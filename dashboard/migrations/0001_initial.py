@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_competitions', models.IntegerField(default=0, verbose_name='إجمالي المسابقات')),
+                ('completed_competitions', models.IntegerField(default=0, verbose_name='المسابقات المكتملة')),
+                ('active_sessions', models.IntegerField(default=0, verbose_name='الجلسات النشطة')),
+                ('score_total', models.FloatField(default=0.0, verbose_name='مجموع النتائج')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات لوحة التحكم',
+                'verbose_name_plural': 'إحصائيات لوحة التحكم',
+            },
+        ),
+        migrations.CreateModel(
+            name='GradeStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade_level', models.CharField(max_length=50, unique=True, verbose_name='المستوى الدراسي')),
+                ('completed_count', models.IntegerField(default=0, verbose_name='عدد المسابقات')),
+                ('score_total', models.FloatField(default=0.0, verbose_name='مجموع النتائج')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات مستوى',
+                'verbose_name_plural': 'إحصائيات المستويات',
+                'ordering': ['grade_level'],
+            },
+        ),
+    ]
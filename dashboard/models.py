@@ -1,4 +1,46 @@
 from django.db import models
 
-# Dashboard app doesn't need specific models
-# It uses models from other apps for analytics and reporting
+
+class DashboardStats(models.Model):
+    """إحصائيات لوحة التحكم المجمعة - صف واحد يُحدَّث تدريجياً"""
+    total_competitions = models.IntegerField(default=0, verbose_name="إجمالي المسابقات")
+    completed_competitions = models.IntegerField(default=0, verbose_name="المسابقات المكتملة")
+    active_sessions = models.IntegerField(default=0, verbose_name="الجلسات النشطة")
+    score_total = models.FloatField(default=0.0, verbose_name="مجموع النتائج")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="آخر تحديث")
+
+    class Meta:
+        verbose_name = "إحصائيات لوحة التحكم"
+        verbose_name_plural = "إحصائيات لوحة التحكم"
+
+    def __str__(self):
+        return f"إحصائيات: {self.completed_competitions} مسابقة مكتملة"
+
+    @property
+    def average_score(self):
+        """متوسط نتائج المسابقات المكتملة"""
+        if self.completed_competitions:
+            return self.score_total / self.completed_competitions
+        return 0
+
+
+class GradeStats(models.Model):
+    """إحصائيات المسابقات المكتملة لكل مستوى دراسي"""
+    grade_level = models.CharField(max_length=50, unique=True, verbose_name="المستوى الدراسي")
+    completed_count = models.IntegerField(default=0, verbose_name="عدد المسابقات")
+    score_total = models.FloatField(default=0.0, verbose_name="مجموع النتائج")
+
+    class Meta:
+        verbose_name = "إحصائيات مستوى"
+        verbose_name_plural = "إحصائيات المستويات"
+        ordering = ['grade_level']
+
+    def __str__(self):
+        return f"{self.grade_level}: {self.completed_count}"
+
+    @property
+    def avg_score(self):
+        """متوسط نتائج المستوى"""
+        if self.completed_count:
+            return self.score_total / self.completed_count
+        return 0
@@ -0,0 +1,57 @@
+"""
+ترقيم الصفحات بالمؤشر (keyset) - منصة المسابقات الرياضية
+Keyset pagination on (end_time, id): every page is an indexed range scan of
+page_size + 1 rows, no matter how deep the reader goes.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def get_page_size(value):
+    """حجم الصفحة من الطلب ضمن الحدود المسموحة"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(competition):
+    """مؤشر الصفحة التالية من آخر صف في الصفحة الحالية"""
+    raw = f'{competition.end_time.isoformat()}|{competition.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """فك المؤشر إلى (end_time, id)، أو None إذا كان غير صالح"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        end_time, competition_id = raw.split('|')
+        return datetime.fromisoformat(end_time), int(competition_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(queryset, cursor, page_size):
+    """صفحة واحدة مرتبة تنازلياً حسب (end_time, id) مع مؤشر الصفحة التالية"""
+    queryset = queryset.order_by('-end_time', '-id')
+
+    position = decode_cursor(cursor)
+    if position:
+        end_time, competition_id = position
+        queryset = queryset.filter(
+            Q(end_time__lt=end_time) | Q(end_time=end_time, id__lt=competition_id)
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
@@ -0,0 +1,122 @@
+"""
+إحصائيات لوحة التحكم المجمعة - منصة المسابقات الرياضية
+Incrementally maintained dashboard rollups (DashboardStats / GradeStats).
+
+Each event costs one F() UPDATE. If the rollup row does not exist yet, the
+whole table is rebuilt from the source data instead, which already includes
+the event being recorded.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .models import DashboardStats, GradeStats
+
+
+STATS_ID = 1
+
+AVAILABLE_GRADES_CACHE_KEY = 'dashboard:available_grades'
+AVAILABLE_GRADES_TIMEOUT = 60 * 60
+
+
+def _increment(**changes):
+    """تحديث ذري لصف الإحصائيات؛ يُعيد البناء إذا لم يكن الصف موجوداً"""
+    updated = DashboardStats.objects.filter(id=STATS_ID).update(
+        **{field: F(field) + value for field, value in changes.items()}
+    )
+    if not updated:
+        rebuild_dashboard_stats()
+        return False
+    return True
+
+
+def record_competition_started():
+    """تسجيل إنشاء مسابقة جديدة"""
+    _increment(total_competitions=1)
+
+
+def record_session_started():
+    """تسجيل جلسة طالب نشطة جديدة"""
+    _increment(active_sessions=1)
+
+
+def record_sessions_ended(count):
+    """تسجيل انتهاء عدد من جلسات الطلاب"""
+    if count:
+        _increment(active_sessions=-count)
+
+
+def record_competition_completed(competition):
+    """تسجيل اكتمال مسابقة في الإحصائيات العامة وإحصائيات المستوى"""
+    with transaction.atomic():
+        if not _increment(completed_competitions=1, score_total=competition.score):
+            return
+
+        updated = GradeStats.objects.filter(grade_level=competition.grade_level).update(
+            completed_count=F('completed_count') + 1,
+            score_total=F('score_total') + competition.score
+        )
+        if not updated:
+            grade_stats, created = GradeStats.objects.get_or_create(
+                grade_level=competition.grade_level,
+                defaults={'completed_count': 1, 'score_total': competition.score}
+            )
+            if created:
+                cache.delete(AVAILABLE_GRADES_CACHE_KEY)
+            else:
+                GradeStats.objects.filter(id=grade_stats.id).update(
+                    completed_count=F('completed_count') + 1,
+                    score_total=F('score_total') + competition.score
+                )
+
+
+def rebuild_dashboard_stats():
+    """إعادة بناء جميع الإحصائيات من جداول المسابقات والجلسات"""
+    from accounts.models import StudentSession
+    from competitions.models import Competition
+
+    completed = Competition.objects.filter(is_completed=True)
+    totals = completed.aggregate(count=Count('id'), score_total=Sum('score'))
+    grade_rows = completed.values('grade_level').annotate(
+        count=Count('id'), score_total=Sum('score')
+    ).order_by('grade_level')
+
+    with transaction.atomic():
+        stats, _ = DashboardStats.objects.update_or_create(
+            id=STATS_ID,
+            defaults={
+                'total_competitions': Competition.objects.count(),
+                'completed_competitions': totals['count'] or 0,
+                'active_sessions': StudentSession.objects.filter(is_active=True).count(),
+                'score_total': totals['score_total'] or 0.0,
+            }
+        )
+        GradeStats.objects.all().delete()
+        GradeStats.objects.bulk_create([
+            GradeStats(
+                grade_level=row['grade_level'],
+                completed_count=row['count'],
+                score_total=row['score_total'] or 0.0
+            )
+            for row in grade_rows
+        ])
+    cache.delete(AVAILABLE_GRADES_CACHE_KEY)
+    return stats
+
+
+def get_dashboard_stats():
+    """قراءة صف الإحصائيات (يُبنى عند أول استخدام)"""
+    stats = DashboardStats.objects.filter(id=STATS_ID).first()
+    if stats is None:
+        stats = rebuild_dashboard_stats()
+    return stats
+
+
+def get_available_grades():
+    """قائمة المستويات التي لها مسابقات مكتملة (مخزنة مؤقتاً)"""
+    return cache.get_or_set(
+        AVAILABLE_GRADES_CACHE_KEY,
+        lambda: list(GradeStats.objects.values_list('grade_level', flat=True)),
+        AVAILABLE_GRADES_TIMEOUT
+    )
@@ -5,4 +5,6 @@ urlpatterns = [
     path('', views.dashboard_home, name='dashboard_home'),
     path('analytics/', views.competition_analytics, name='competition_analytics'),
     path('reports/', views.student_reports, name='student_reports'),
+    path('export/', views.export_results, name='export_results'),
+    path('question-pool/', views.question_pool_stats, name='question_pool_stats'),
 ]
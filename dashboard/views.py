@@ -1,38 +1,30 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Avg
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 
 
 @login_required
 def dashboard_home(request):
     """الصفحة الرئيسية للوحة التحكم"""
     try:
-        from competitions.models import Competition, Answer
-        from accounts.models import StudentSession
+        from competitions.models import Competition
+        from .models import GradeStats
+        from .stats import get_dashboard_stats
 
-        # إحصائيات عامة
-        total_competitions = Competition.objects.count()
-        completed_competitions = Competition.objects.filter(is_completed=True).count()
-        active_sessions = StudentSession.objects.filter(is_active=True).count()
-        average_score = Competition.objects.filter(is_completed=True).aggregate(
-            avg_score=Avg('score')
-        )['avg_score'] or 0
+        # إحصائيات عامة من جدول الإحصائيات المجمعة (صف واحد)
+        stats = get_dashboard_stats()
 
         # إحصائيات حسب المستوى
-        grade_stats = Competition.objects.filter(is_completed=True).values('grade_level').annotate(
-            count=Count('id'),
-            avg_score=Avg('score')
-        ).order_by('grade_level')
+        grade_stats = GradeStats.objects.all()
 
         # آخر المسابقات
         recent_competitions = Competition.objects.filter(is_completed=True).order_by('-end_time')[:10]
 
         context = {
-            'total_competitions': total_competitions,
-            'completed_competitions': completed_competitions,
-            'active_sessions': active_sessions,
-            'average_score': round(average_score, 2),
+            'total_competitions': stats.total_competitions,
+            'completed_competitions': stats.completed_competitions,
+            'active_sessions': stats.active_sessions,
+            'average_score': round(stats.average_score, 2),
             'grade_stats': grade_stats,
             'recent_competitions': recent_competitions,
         }
@@ -56,25 +48,36 @@ def dashboard_home(request):
 def competition_analytics(request):
     """تحليلات المسابقات"""
     try:
-        from competitions.models import Competition
+        from competitions.models import Answer, Competition
+        from .analytics import (
+            get_score_buckets,
+            operation_accuracy,
+            score_histogram,
+            score_histogram_by,
+        )
 
         # إحصائيات مفصلة
         competitions = Competition.objects.filter(is_completed=True)
+        buckets = get_score_buckets(request.GET.get('edges'))
 
-        # توزيع النتائج
-        score_ranges = {
-            'excellent': competitions.filter(score__gte=90).count(),
-            'good': competitions.filter(score__gte=70, score__lt=90).count(),
-            'average': competitions.filter(score__gte=50, score__lt=70).count(),
-            'poor': competitions.filter(score__lt=50).count(),
-        }
+        # توزيع النتائج باستعلام واحد بدلاً من استعلام لكل نطاق
+        histogram = score_histogram(competitions, buckets)
+        score_ranges = {bucket['key']: bucket['count'] for bucket in histogram['buckets']}
 
-        # أداء حسب نوع العملية (سيتم تطويره لاحقاً)
-        operation_stats = {}
+        # أداء حسب نوع العملية
+        operation_stats = operation_accuracy(Answer.objects.all())
 
         context = {
-            'competitions': competitions,
+            'total_completed': histogram['total'],
+            'buckets': buckets,
+            'histogram': histogram['buckets'],
             'score_ranges': score_ranges,
+            'breakdowns': [
+                ('📚 التوزيع حسب المستوى', score_histogram_by(competitions, 'grade_level', buckets)),
+                ('🎯 التوزيع حسب الصعوبة', score_histogram_by(
+                    competitions, 'difficulty', buckets, dict(Competition._meta.get_field('difficulty').choices)
+                )),
+            ],
             'operation_stats': operation_stats,
         }
 
@@ -96,21 +99,32 @@ def student_reports(request):
     """تقارير الطلاب"""
     try:
         from competitions.models import Competition
+        from .export import XLSX_MAX_ROWS
+        from .pagination import get_page_size, keyset_page
+        from .stats import get_available_grades
 
-        competitions = Competition.objects.filter(is_completed=True).order_by('-end_time')
+        competitions = Competition.objects.filter(is_completed=True)
 
         # فلترة حسب المستوى إذا تم تحديده
         grade_filter = request.GET.get('grade')
         if grade_filter:
             competitions = competitions.filter(grade_level=grade_filter)
 
+        # صفحة واحدة فقط بالمؤشر (end_time, id) بدلاً من تحميل جميع المسابقات
+        page_size = get_page_size(request.GET.get('size'))
+        page, next_cursor = keyset_page(competitions, request.GET.get('cursor'), page_size)
+
         # الحصول على قائمة المستويات المتاحة
-        available_grades = Competition.objects.values_list('grade_level', flat=True).distinct()
+        available_grades = get_available_grades()
 
         context = {
-            'competitions': competitions,
+            'competitions': page,
             'available_grades': available_grades,
             'selected_grade': grade_filter,
+            'page_size': page_size,
+            'next_cursor': next_cursor,
+            'is_first_page': not request.GET.get('cursor'),
+            'xlsx_max_rows': XLSX_MAX_ROWS,
         }
 
         return render(request, 'dashboard/reports.html', context)
@@ -124,3 +138,47 @@ def student_reports(request):
             <a href="/" style="background: #3498db; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">العودة للرئيسية</a>
         </div>
         """)
+
+
+@login_required
+def export_results(request):
+    """تصدير نتائج المسابقات (CSV أو XLSX)"""
+    from competitions.models import Answer, Competition
+    from . import export
+
+    grade_filter = request.GET.get('grade')
+    export_format = request.GET.get('format', 'csv')
+
+    if request.GET.get('rows') == 'answers':
+        answers = Answer.objects.filter(competition__is_completed=True)
+        if grade_filter:
+            answers = answers.filter(competition__grade_level=grade_filter)
+        queryset, headers, rows, filename = answers, export.ANSWER_HEADERS, export.answer_rows(answers), 'answers'
+    else:
+        competitions = Competition.objects.filter(is_completed=True)
+        if grade_filter:
+            competitions = competitions.filter(grade_level=grade_filter)
+        queryset, headers, rows, filename = (
+            competitions, export.COMPETITION_HEADERS, export.competition_rows(competitions), 'competitions'
+        )
+
+    if export_format == 'xlsx':
+        # ملف XLSX يُبنى كاملاً قبل الإرسال، لذا التصديرات الكبيرة تذهب إلى CSV المتدفق
+        if queryset.count() > export.XLSX_MAX_ROWS:
+            return HttpResponse(
+                f'تصدير XLSX محدود بـ {export.XLSX_MAX_ROWS} صف؛ استخدم تصدير CSV للبيانات الأكبر',
+                status=413
+            )
+        if not export.xlsx_available():
+            return HttpResponse('تصدير XLSX يتطلب تثبيت مكتبة openpyxl', status=501)
+        return export.build_xlsx(headers, rows, filename)
+
+    return export.stream_csv(headers, rows, filename)
+
+
+@login_required
+def question_pool_stats(request):
+    """عدادات مخزن الأسئلة الجاهزة في هذه العملية"""
+    from competitions.pool import get_pool
+
+    return JsonResponse(get_pool().stats())
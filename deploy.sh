@@ -7,7 +7,8 @@ echo "🚀 بدء عملية النشر..."
 echo "Starting deployment process..."
 
 # تحديد متغيرات البيئة
-export DJANGO_SETTINGS_MODULE=alhassan.production_settings
+export DJANGO_SETTINGS_MODULE=alhassan.settings
+export DJANGO_ENV=${DJANGO_ENV:-production}
 export PYTHONPATH=.
 
 echo "📊 تطبيق هجرات قاعدة البيانات..."
@@ -2,11 +2,15 @@
 
 # تحديد متغيرات البيئة
 export DJANGO_SETTINGS_MODULE=alhassan.settings
+export DJANGO_ENV=${DJANGO_ENV:-production}
 export PYTHONPATH=.
 
 # تطبيق migrations
 python manage.py migrate --noinput
 
+# تعبئة بنك الأسئلة مرة واحدة قبل بدء العمال
+python manage.py build_question_bank --top-up
+
 # جمع الملفات الثابتة
 python manage.py collectstatic --noinput --clear
 